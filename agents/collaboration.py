@@ -1,9 +1,52 @@
 """Agent collaboration system for cross-validation and iterative refinement."""
 
-from typing import Dict, List, Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
 from models import DesignPrinciples, DesignTokens, ComponentInventory, ValidationResult
 from agents.validator import Validator
 
+# Shared pool for running independent validation checks side by side
+_VALIDATION_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="validation")
+
+# Any single check scoring below this forces refinement regardless of the overall mean
+HARD_FAIL_SCORE = 0.3
+
+# Content-addressed LRU cache of validation results, so refinement loops that
+# re-submit unchanged models skip the validator entirely
+_VALIDATION_CACHE_MAXSIZE = 256
+_validation_cache: "OrderedDict[Tuple[str, ...], ValidationResult]" = OrderedDict()
+_validation_cache_lock = threading.Lock()
+_validation_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _model_hash(model: BaseModel) -> str:
+    """Stable content hash of a pydantic model."""
+    return hashlib.sha256(model.model_dump_json().encode()).hexdigest()
+
+
+def _cached_validation(key: Tuple[str, ...], validate: Callable[..., ValidationResult], *args: Any) -> ValidationResult:
+    """Return the cached result for key, running validate on a miss."""
+    with _validation_cache_lock:
+        result = _validation_cache.get(key)
+        if result is not None:
+            _validation_cache.move_to_end(key)
+            _validation_cache_stats["hits"] += 1
+            return result
+        _validation_cache_stats["misses"] += 1
+    
+    result = validate(*args)
+    
+    with _validation_cache_lock:
+        _validation_cache[key] = result
+        _validation_cache.move_to_end(key)
+        while len(_validation_cache) > _VALIDATION_CACHE_MAXSIZE:
+            _validation_cache.popitem(last=False)
+    return result
+
 
 class AgentCollaboration:
     """Enables agents to validate and refine each other's work."""
@@ -14,12 +57,14 @@ class AgentCollaboration:
         tokens: DesignTokens
     ) -> ValidationResult:
         """Validate that tokens align with design principles."""
-        return Validator.validate_design_consistency(principles, tokens)
+        key = ("principles_tokens", _model_hash(principles), _model_hash(tokens))
+        return _cached_validation(key, Validator.validate_design_consistency, principles, tokens)
 
     @staticmethod
     def validate_tokens_accessibility(tokens: DesignTokens) -> ValidationResult:
         """Validate token accessibility."""
-        return Validator.validate_color_accessibility(tokens)
+        key = ("tokens_accessibility", _model_hash(tokens))
+        return _cached_validation(key, Validator.validate_color_accessibility, tokens)
 
     @staticmethod
     def validate_inventory_completeness(
@@ -29,7 +74,10 @@ class AgentCollaboration:
     ) -> ValidationResult:
         """Validate component inventory completeness."""
         industry = principles.industry_context.industry if principles.industry_context else "unknown"
-        return Validator.validate_component_completeness(inventory, industry, product_context)
+        key = ("inventory_completeness", _model_hash(inventory), industry, product_context)
+        return _cached_validation(
+            key, Validator.validate_component_completeness, inventory, industry, product_context
+        )
 
     @staticmethod
     def check_cross_agent_consistency(
@@ -39,20 +87,39 @@ class AgentCollaboration:
         product_context: str
     ) -> Dict[str, ValidationResult]:
         """Run all cross-agent validation checks."""
-        results = {}
-        
-        # Check principles-tokens consistency
-        results["principles_tokens"] = AgentCollaboration.validate_principles_tokens(principles, tokens)
+        # The checks share no state, so submit them together and collect the results
+        futures = {
+            "principles_tokens": _VALIDATION_EXECUTOR.submit(
+                AgentCollaboration.validate_principles_tokens, principles, tokens
+            ),
+            "tokens_accessibility": _VALIDATION_EXECUTOR.submit(
+                AgentCollaboration.validate_tokens_accessibility, tokens
+            ),
+            "inventory_completeness": _VALIDATION_EXECUTOR.submit(
+                AgentCollaboration.validate_inventory_completeness, inventory, principles, product_context
+            ),
+        }
         
-        # Check token accessibility
-        results["tokens_accessibility"] = AgentCollaboration.validate_tokens_accessibility(tokens)
-        
-        # Check inventory completeness
-        results["inventory_completeness"] = AgentCollaboration.validate_inventory_completeness(
-            inventory, principles, product_context
-        )
-        
-        return results
+        return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def cache_info() -> Dict[str, int]:
+        """Return hit/miss counters for the validation result cache."""
+        with _validation_cache_lock:
+            return {
+                "hits": _validation_cache_stats["hits"],
+                "misses": _validation_cache_stats["misses"],
+                "maxsize": _VALIDATION_CACHE_MAXSIZE,
+                "currsize": len(_validation_cache),
+            }
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Drop all cached validation results and reset the counters."""
+        with _validation_cache_lock:
+            _validation_cache.clear()
+            _validation_cache_stats["hits"] = 0
+            _validation_cache_stats["misses"] = 0
 
     @staticmethod
     def refine_tokens_based_on_validation(
@@ -71,14 +138,30 @@ class AgentCollaboration:
     @staticmethod
     def get_quality_score(validation_results: Dict[str, ValidationResult]) -> float:
         """Calculate overall quality score from validation results."""
-        if not validation_results:
-            return 0.0
-        
-        scores = [result.score for result in validation_results.values()]
-        return sum(scores) / len(scores) if scores else 0.0
+        total = 0.0
+        count = 0
+        for result in validation_results.values():
+            total += result.score
+            count += 1
+        return total / count if count else 0.0
 
     @staticmethod
     def should_refine(validation_results: Dict[str, ValidationResult], threshold: float = 0.7) -> bool:
         """Determine if refinement is needed based on quality score."""
-        quality_score = AgentCollaboration.get_quality_score(validation_results)
-        return quality_score < threshold
+        count = len(validation_results)
+        if not count:
+            # No checks ran, so there is no evidence of quality: treat it as a score of 0,
+            # which needs refinement under any positive threshold
+            return threshold > 0
+        
+        # Scores are at most 1, so stop once even perfect remaining scores can't lift the mean
+        total = 0.0
+        remaining = count
+        for result in validation_results.values():
+            if result.score < HARD_FAIL_SCORE:
+                return True  # A blocking failure needs refinement whatever the mean
+            total += result.score
+            remaining -= 1
+            if (total + remaining) / count < threshold:
+                return True
+        return total / count < threshold
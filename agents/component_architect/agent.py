@@ -1,40 +1,39 @@
 """Component Architect Agent - Defines component inventory and specifications with enhanced autonomy."""
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import DesignPrinciples, ComponentInventory, ComponentSpec
-import json
-from litellm import completion
-from dotenv import load_dotenv
+from typing import Any, Dict, Optional
+from agents import config
 from agents.knowledge_base import KnowledgeBase
 from agents.prompts import PromptTemplates
+from agents import llm_cache
+from agents.llm_client import complete_json
 
-load_dotenv()
+# Category for specialized components; anything not listed is "contextual"
+_LAYOUT_NAMES = frozenset({"Hero", "Header", "Footer", "Sidebar"})
+_DATA_NAMES = frozenset({"DataTable", "DashboardStat", "PricingTable"})
+_NAVIGATION_NAMES = frozenset({"Pagination", "Breadcrumb", "Tabs"})
+_FEEDBACK_NAMES = frozenset({"Progress", "Skeleton", "Accordion"})
+
+# Components reused across every product, in the order they are reported
+_REUSABLE_COMPONENTS = ("Button", "Input", "Select", "Modal", "Alert", "Card", "Badge", "Tooltip", "Container", "Stack", "Grid")
+_REUSABLE = frozenset(_REUSABLE_COMPONENTS)
+
+# Components whose variants/states are always taken from the knowledge base, even over AI suggestions
+_FIXED_SPEC_NAMES = frozenset({"Hero", "DataTable", "Pagination", "Tabs", "Progress"})
 
 class ComponentArchitectAgent:
     """Agent that defines the complete component inventory and their specifications."""
 
     def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
-        # Auto-detect model based on API key if MODEL_NAME not explicitly set
-        if os.getenv("MODEL_NAME"):
-            self.model = os.getenv("MODEL_NAME")
-        elif os.getenv("GEMINI_API_KEY"):
-            self.model = "gemini/gemini-1.5-pro-latest"
-        elif os.getenv("OPENAI_API_KEY"):
-            self.model = "gpt-5"  # Best for complex reasoning and structured JSON output
-        elif os.getenv("ANTHROPIC_API_KEY"):
-            self.model = "claude-3-5-sonnet-20241022"
-        else:
-            self.model = "gemini/gemini-1.5-pro-latest"  # fallback default
+        self.api_key = config.API_KEY
+        self.model = config.MODEL_NAME
 
-    def generate_component_inventory(self, principles: DesignPrinciples, product_context: str) -> ComponentInventory:
+    def prepare_component_context(self, industry: str) -> Dict[str, Any]:
         """
-        Generate a complete component inventory based on design principles and product context.
+        Build the industry-dependent inputs for inventory generation.
+
+        This is cheap and local, so the orchestrator can run it while the strategist is still waiting on the LLM.
         """
-        industry = principles.industry_context.industry if principles.industry_context else "unknown"
-        
         # Base component inventory that every system needs
         base_components = [
             ComponentSpec(
@@ -103,78 +102,99 @@ class ComponentArchitectAgent:
             ),
         ]
 
-        # Get industry-specific components
-        industry_components = KnowledgeBase.get_components_for_industry(industry)
+        return {
+            "industry": industry,
+            "base_components": base_components,
+            "industry_components": KnowledgeBase.get_profile(industry).components
+        }
+
+    def generate_component_inventory(
+        self,
+        principles: DesignPrinciples,
+        product_context: str,
+        prefetched_context: Optional[Dict[str, Any]] = None
+    ) -> ComponentInventory:
+        """
+        Generate a complete component inventory based on design principles and product context.
+        """
+        industry = principles.industry_context.industry if principles.industry_context else "unknown"
+        
+        # Reuse the speculatively prepared context when the industry guess was right
+        if prefetched_context and prefetched_context.get("industry") == industry:
+            context = prefetched_context
+        else:
+            context = self.prepare_component_context(industry)
+        base_components = context["base_components"]
+        industry_components = context["industry_components"]
         
         # Add specialized components based on industry and AI analysis
         additional_components = []
         component_variants = {}
         component_states = {}
         reasoning = ""
+        fresh_response = None
         
-        if self.api_key:
+        # Skip the LLM when the knowledge base already fully specifies this industry's inventory
+        if self.api_key and not KnowledgeBase.has_complete_coverage(industry):
             try:
-                prompt = PromptTemplates.component_architect_prompt(principles, product_context, industry, base_components)
+                system_prefix, user_message = PromptTemplates.component_architect_prompt(principles, product_context, industry, base_components)
                 
-                response = completion(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"}
-                )
+                # Reuse a previous answer for the same (or a near-identical) product context
+                cache_key = llm_cache.prompt_hash(system_prefix, user_message)
+                cache_scope = llm_cache.prompt_hash(system_prefix, industry, principles.philosophy)
+                embedding = llm_cache.embed(product_context)
+                data = llm_cache.lookup(self.model, cache_key, embedding, cache_scope)
                 
-                data = json.loads(response.choices[0].message.content)
+                if data is None:
+                    data = complete_json(
+                        model=self.model,
+                        messages=PromptTemplates.cached_messages(self.model, system_prefix, user_message),
+                        response_format={"type": "json_object"}
+                    )
+                    fresh_response = data
                 additional_components = data.get("additional_components", [])
                 component_variants = data.get("component_variants", {})
                 component_states = data.get("component_states", {})
                 reasoning = data.get("reasoning", "")
             except Exception as e:
+                fresh_response = None
                 print(f"AI Component selection failed, falling back to rules: {e}")
         
+        base_names = {c.name for c in base_components}
+        
         # Fallback: Use industry knowledge base
-        if not additional_components:
+        use_kb_specs = not additional_components
+        if use_kb_specs:
             # Get components from knowledge base that aren't in base set
             for comp_name in industry_components:
-                if comp_name not in [c.name for c in base_components]:
+                if comp_name not in base_names:
                     additional_components.append(comp_name)
         
         # Add specialized components
         specialized_components = []
         for comp_name in additional_components:
             # Check if component already exists
-            if any(c.name == comp_name for c in base_components):
+            if comp_name in base_names:
                 continue
             
             # Determine category
             category = "contextual"
-            if comp_name in ["Hero", "Header", "Footer", "Sidebar"]:
+            if comp_name in _LAYOUT_NAMES:
                 category = "layout"
-            elif comp_name in ["DataTable", "DashboardStat", "PricingTable"]:
+            elif comp_name in _DATA_NAMES:
                 category = "data"
-            elif comp_name in ["Pagination", "Breadcrumb", "Tabs"]:
+            elif comp_name in _NAVIGATION_NAMES:
                 category = "navigation"
-            elif comp_name in ["Progress", "Skeleton", "Accordion"]:
+            elif comp_name in _FEEDBACK_NAMES:
                 category = "feedback"
             
-            # Get variants and states from AI or use defaults
-            variants = component_variants.get(comp_name, ["default"])
-            states = component_states.get(comp_name, ["default"])
-            
-            # Enhance with common variants/states based on component type
-            if comp_name == "Hero":
-                variants = ["default", "centered", "split"]
-                states = ["default"]
-            elif comp_name == "DataTable":
-                variants = ["default", "sortable", "filterable"]
-                states = ["default", "loading", "empty"]
-            elif comp_name == "Pagination":
-                variants = ["default", "compact"]
-                states = ["default", "disabled"]
-            elif comp_name == "Tabs":
-                variants = ["default", "pills", "underline"]
-                states = ["default", "active", "disabled"]
-            elif comp_name == "Progress":
-                variants = ["default", "circular", "linear"]
-                states = ["default", "indeterminate"]
+            # Use common variants/states for known component types, otherwise the AI's or defaults
+            spec = KnowledgeBase.get_component_spec(comp_name)
+            if spec and (use_kb_specs or comp_name in _FIXED_SPEC_NAMES):
+                variants, states = list(spec["variants"]), list(spec["states"])
+            else:
+                variants = component_variants.get(comp_name, ["default"])
+                states = component_states.get(comp_name, ["default"])
             
             specialized_components.append(ComponentSpec(
                 name=comp_name,
@@ -185,11 +205,10 @@ class ComponentArchitectAgent:
                 accessibility_notes="Context-specific semantic markup and ARIA attributes"
             ))
         
-        # Add component dependencies
-        all_component_names = [c.name for c in base_components + specialized_components]
+        # Add component dependencies, including indirect ones, so the inventory is closed
+        all_component_names = base_names | {c.name for c in specialized_components}
         for component in base_components + specialized_components:
-            dependencies = KnowledgeBase.get_component_dependencies(component.name)
-            for dep in dependencies:
+            for dep in KnowledgeBase.get_transitive_dependencies(component.name):
                 if dep not in all_component_names:
                     # Add missing dependency
                     specialized_components.append(ComponentSpec(
@@ -200,22 +219,27 @@ class ComponentArchitectAgent:
                         description=f"Required dependency for {component.name}",
                         accessibility_notes="Standard accessibility requirements"
                     ))
-                    all_component_names.append(dep)
+                    all_component_names.add(dep)
         
         # Combine all components
         all_components = base_components + specialized_components
         
         # Categorize components
-        reusable_components = ["Button", "Input", "Select", "Modal", "Alert", "Card", "Badge", "Tooltip", "Container", "Stack", "Grid"]
-        contextual_components = [c.name for c in all_components if c.name not in reusable_components]
+        reusable_components = list(_REUSABLE_COMPONENTS)
+        contextual_components = [c.name for c in all_components if c.name not in _REUSABLE]
         
         # Generate reasoning if not provided
         if not reasoning:
-            reasoning = f"Component inventory generated for {industry} industry. Base components provide core functionality, while specialized components ({', '.join([c.name for c in specialized_components])}) address specific needs of {product_context}."
+            reasoning = f"Component inventory generated for {industry} industry. Base components provide core functionality, while specialized components ({', '.join(c.name for c in specialized_components)}) address specific needs of {product_context}."
         
-        return ComponentInventory(
+        inventory = ComponentInventory(
             components=all_components,
             reusable_components=reusable_components,
             contextual_components=contextual_components,
             reasoning=reasoning
         )
+        
+        # Only cache responses that produced a valid inventory
+        if fresh_response is not None:
+            llm_cache.store(self.model, cache_key, fresh_response, embedding, cache_scope)
+        return inventory
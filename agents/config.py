@@ -0,0 +1,25 @@
+"""LLM credentials and model selection, resolved once at import."""
+
+import os
+
+# Vercel injects environment variables directly, so serverless cold starts skip dotenv entirely
+if not os.getenv("VERCEL"):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _resolve_model() -> str:
+    """Pick the model from MODEL_NAME, or auto-detect it from whichever API key is set."""
+    if os.getenv("MODEL_NAME"):
+        return os.getenv("MODEL_NAME")
+    if os.getenv("GEMINI_API_KEY"):
+        return "gemini/gemini-1.5-pro-latest"
+    if os.getenv("OPENAI_API_KEY"):
+        return "gpt-5"  # Best for complex reasoning and structured JSON output
+    if os.getenv("ANTHROPIC_API_KEY"):
+        return "claude-3-5-sonnet-20241022"
+    return "gemini/gemini-1.5-pro-latest"  # fallback default
+
+
+API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
+MODEL_NAME = _resolve_model()
@@ -1,33 +1,39 @@
 """Design Strategist Agent - The core decision-making engine with enhanced autonomy."""
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models import DesignSystemInput, DesignPrinciples, AgentReasoning, ConfidenceScore, IndustryContext
-import json
-from litellm import completion
-from dotenv import load_dotenv
+from models import DesignSystemInput, DesignPrinciples, AgentReasoning, ConfidenceScore, IndustryContext, enum_values
+from agents import config
 from agents.knowledge_base import KnowledgeBase
 from agents.prompts import PromptTemplates
+from agents import llm_cache
+from agents.llm_client import complete_json
 
-load_dotenv()
+# (users, traits) inferred from the industry when the input doesn't provide them
+_INDUSTRY_DEFAULTS = {
+    "healthcare": (("enterprise", "B2B"), ("professional", "minimal")),
+    "finance": (("enterprise", "B2B"), ("professional", "minimal")),
+    "enterprise": (("B2B",), ("professional", "minimal")),
+    "ecommerce": (("consumer", "B2C"), ("modern", "bold")),
+    "consumer": (("consumer", "B2C"), ("modern", "bold")),
+    "marketing": (("B2B",), ("modern", "bold")),
+}
+_FALLBACK_DEFAULTS = (("B2B",), ("modern", "professional"))
+
+# (forbidden, required) traits applied when the fallback traits conflict
+_REGULATED_TRAITS = (frozenset({"playful", "bold"}), ("professional",))
+_EXPRESSIVE_TRAITS = (frozenset({"clinical", "minimal"}), ())
+_TRAIT_ADJUSTMENTS = {
+    "healthcare": _REGULATED_TRAITS,
+    "finance": _REGULATED_TRAITS,
+    "marketing": _EXPRESSIVE_TRAITS,
+    "consumer": _EXPRESSIVE_TRAITS,
+}
 
 class DesignStrategistAgent:
     """Agent that defines design principles and system philosophy based on product requirements."""
 
     def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
-        # Auto-detect model based on API key if MODEL_NAME not explicitly set
-        if os.getenv("MODEL_NAME"):
-            self.model = os.getenv("MODEL_NAME")
-        elif os.getenv("GEMINI_API_KEY"):
-            self.model = "gemini/gemini-1.5-pro-latest"
-        elif os.getenv("OPENAI_API_KEY"):
-            self.model = "gpt-5"  # Best for complex reasoning and structured JSON output
-        elif os.getenv("ANTHROPIC_API_KEY"):
-            self.model = "claude-3-5-sonnet-20241022"
-        else:
-            self.model = "gemini/gemini-1.5-pro-latest"  # fallback default
+        self.api_key = config.API_KEY
+        self.model = config.MODEL_NAME
 
     def analyze_product_requirements(self, input_data: DesignSystemInput) -> DesignPrinciples:
         """
@@ -37,30 +43,30 @@ class DesignStrategistAgent:
         industry = KnowledgeBase.detect_industry(input_data.product_idea)
         
         # Step 2: Get industry context
-        industry_context = {
-            "philosophy": KnowledgeBase.get_philosophy_for_industry(industry),
-            "density": KnowledgeBase.get_density_for_industry(industry),
-            "warmth": KnowledgeBase.get_warmth_for_industry(industry),
-            "clarity": KnowledgeBase.get_clarity_for_industry(industry),
-            "speed": KnowledgeBase.get_speed_for_industry(industry)
-        }
+        industry_context = KnowledgeBase.get_industry_context(industry)
         
         # Step 3: Check for trait conflicts
-        user_traits = [t.value for t in input_data.brand_traits] if input_data.brand_traits else []
+        user_traits = enum_values(input_data.brand_traits)
         trait_conflicts = KnowledgeBase.check_trait_conflicts(user_traits)
         
         # Step 4: Use AI with enhanced prompt if available
         if self.api_key:
             try:
-                prompt = PromptTemplates.design_strategist_prompt(input_data, industry, industry_context)
+                system_prefix, user_message = PromptTemplates.design_strategist_prompt(input_data, industry, industry_context)
                 
-                response = completion(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"}
-                )
+                # Reuse a previous answer for the same (or a near-identical) product description
+                cache_key = llm_cache.prompt_hash(system_prefix, user_message)
+                cache_scope = llm_cache.prompt_hash(system_prefix, industry, input_data.model_dump_json(exclude={"product_idea"}))
+                embedding = llm_cache.embed(input_data.product_idea)
+                data = llm_cache.lookup(self.model, cache_key, embedding, cache_scope)
+                from_cache = data is not None
                 
-                data = json.loads(response.choices[0].message.content)
+                if not from_cache:
+                    data = complete_json(
+                        model=self.model,
+                        messages=PromptTemplates.cached_messages(self.model, system_prefix, user_message),
+                        response_format={"type": "json_object"}
+                    )
                 
                 # Extract reasoning if provided
                 reasoning = None
@@ -91,7 +97,7 @@ class DesignStrategistAgent:
                 final_users = inferred_users
                 if input_data.target_users:
                     # Check if user inputs make sense - if not, use inferred
-                    user_provided = [u.value for u in input_data.target_users]
+                    user_provided = enum_values(input_data.target_users)
                     # For now, prefer inferred if they're more specific
                     if len(inferred_users) > 0:
                         final_users = inferred_users
@@ -100,7 +106,7 @@ class DesignStrategistAgent:
                 
                 final_traits = inferred_traits
                 if input_data.brand_traits:
-                    user_provided_traits = [t.value for t in input_data.brand_traits]
+                    user_provided_traits = user_traits
                     # Override if conflicts detected
                     if trait_conflicts:
                         # Use inferred traits if user traits conflict
@@ -114,10 +120,10 @@ class DesignStrategistAgent:
                 
                 final_platforms = inferred_platforms
                 if input_data.platforms:
-                    user_provided_platforms = [p.value for p in input_data.platforms]
+                    user_provided_platforms = enum_values(input_data.platforms)
                     final_platforms = inferred_platforms if len(inferred_platforms) > 0 else user_provided_platforms
                 
-                return DesignPrinciples(
+                principles = DesignPrinciples(
                     clarity=data.get("clarity", industry_context["clarity"]),
                     density=data.get("density", industry_context["density"]),
                     warmth=data.get("warmth", industry_context["warmth"]),
@@ -129,44 +135,34 @@ class DesignStrategistAgent:
                     reasoning=reasoning,
                     industry_context=industry_context_obj
                 )
+                
+                # Only cache responses that produced valid principles
+                if not from_cache:
+                    llm_cache.store(self.model, cache_key, data, embedding, cache_scope)
+                return principles
             except Exception as e:
                 print(f"AI Strategy failed, falling back to rules: {e}")
 
         # Fallback to rule-based logic with industry context
-        traits = [t.value for t in input_data.brand_traits] if input_data.brand_traits else []
-        users = [u.value for u in input_data.target_users] if input_data.target_users else []
+        traits = list(user_traits)
+        users = enum_values(input_data.target_users)
         
         # Use industry defaults if no user input
+        default_users, default_traits = _INDUSTRY_DEFAULTS.get(industry, _FALLBACK_DEFAULTS)
         if not users:
-            # Infer from industry
-            if industry == "healthcare" or industry == "finance":
-                users = ["enterprise", "B2B"]
-            elif industry == "ecommerce" or industry == "consumer":
-                users = ["consumer", "B2C"]
-            elif industry == "saas" or industry == "dashboard":
-                users = ["B2B"]
-            else:
-                users = ["B2B"]
+            users = list(default_users)
         
         if not traits:
-            # Infer from industry
-            if industry in ["healthcare", "finance", "enterprise"]:
-                traits = ["professional", "minimal"]
-            elif industry in ["ecommerce", "consumer", "marketing"]:
-                traits = ["modern", "bold"]
-            else:
-                traits = ["modern", "professional"]
+            traits = list(default_traits)
         
         # Override conflicting traits
         trait_conflicts = KnowledgeBase.check_trait_conflicts(traits)
-        if trait_conflicts:
+        adjustment = _TRAIT_ADJUSTMENTS.get(industry)
+        if trait_conflicts and adjustment:
             # Remove conflicting traits, prefer industry-appropriate ones
-            if industry in ["healthcare", "finance"]:
-                traits = [t for t in traits if t not in ["playful", "bold"]]
-                if "professional" not in traits:
-                    traits.append("professional")
-            elif industry in ["marketing", "consumer"]:
-                traits = [t for t in traits if t not in ["clinical", "minimal"]]
+            forbidden, required = adjustment
+            traits = [t for t in traits if t not in forbidden]
+            traits.extend(t for t in required if t not in traits)
         
         # Determine principles
         is_enterprise = "enterprise" in users or "B2B" in users
@@ -212,7 +208,7 @@ class DesignStrategistAgent:
             philosophy=philosophy,
             inferred_users=users,
             inferred_traits=traits,
-            inferred_platforms=[p.value for p in input_data.platforms] if input_data.platforms else ["web"],
+            inferred_platforms=enum_values(input_data.platforms) or ["web"],
             reasoning=reasoning,
             industry_context=industry_context_obj
         )
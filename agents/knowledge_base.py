@@ -1,6 +1,10 @@
 """Knowledge base for design system generation - industry patterns, best practices, and domain expertise."""
 
-from typing import Dict, List, Optional
+import functools
+import re
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
 from enum import Enum
 
 
@@ -19,11 +23,25 @@ class Industry(str, Enum):
     UNKNOWN = "unknown"
 
 
+@dataclass(frozen=True, slots=True)
+class IndustryProfile:
+    """Everything the knowledge base knows about one industry, resolved once."""
+    philosophy: str
+    density: str
+    warmth: int
+    clarity: int
+    speed: int
+    # Excluded from hashing so profiles stay usable as cache keys
+    colors: Optional[Mapping[str, str]] = field(hash=False)
+    components: Tuple[str, ...]
+    accessibility: Tuple[str, ...]
+
+
 class KnowledgeBase:
     """Centralized knowledge base for design system generation."""
 
     # Industry-specific color palettes (primary color suggestions)
-    INDUSTRY_COLORS: Dict[str, Dict[str, str]] = {
+    INDUSTRY_COLORS: Mapping[str, Dict[str, str]] = MappingProxyType({
         "healthcare": {
             "primary": "#2563EB",  # Trustworthy blue
             "accent": "#10B981",  # Health green
@@ -78,10 +96,13 @@ class KnowledgeBase:
             "neutral": "#6B7280",  # Approachable gray
             "rationale": "Warm, approachable colors encourage interaction"
         }
-    }
+    })
+
+    # Core components the component architect specifies itself for every product
+    CORE_COMPONENTS: FrozenSet[str] = frozenset({"Button", "Input", "Select", "Modal", "Alert", "Card", "Table", "Navigation"})
 
     # Component inventory by product type
-    COMPONENT_BY_INDUSTRY: Dict[str, List[str]] = {
+    COMPONENT_BY_INDUSTRY: Mapping[str, List[str]] = MappingProxyType({
         "ecommerce": [
             "Button", "Input", "Select", "Card", "Badge", "Modal", "Alert",
             "Table", "Pagination", "Search", "Breadcrumb", "Hero", "PricingTable"
@@ -115,10 +136,10 @@ class KnowledgeBase:
             "Button", "Input", "Select", "Card", "Modal", "Alert", "Navigation",
             "Hero", "Badge", "Avatar", "Tabs", "Header", "Footer"
         ]
-    }
+    })
 
     # Component dependencies
-    COMPONENT_DEPENDENCIES: Dict[str, List[str]] = {
+    COMPONENT_DEPENDENCIES: Mapping[str, List[str]] = MappingProxyType({
         "Table": ["Pagination", "Search"],
         "DataTable": ["Table", "Pagination", "Search", "Select"],
         "Navigation": ["Header"],
@@ -126,10 +147,32 @@ class KnowledgeBase:
         "DashboardStat": ["Card"],
         "PricingTable": ["Card", "Button"],
         "Hero": ["Button"]
-    }
+    })
+
+    # Variants and states for specialized components
+    COMPONENT_SPECS: Mapping[str, Dict[str, List[str]]] = MappingProxyType({
+        "Hero": {"variants": ["default", "centered", "split"], "states": ["default"]},
+        "DataTable": {"variants": ["default", "sortable", "filterable"], "states": ["default", "loading", "empty"]},
+        "Pagination": {"variants": ["default", "compact"], "states": ["default", "disabled"]},
+        "Tabs": {"variants": ["default", "pills", "underline"], "states": ["default", "active", "disabled"]},
+        "Progress": {"variants": ["default", "circular", "linear"], "states": ["default", "indeterminate"]},
+        "Sidebar": {"variants": ["default", "collapsible"], "states": ["default", "collapsed", "expanded"]},
+        "Header": {"variants": ["default", "sticky", "transparent"], "states": ["default", "scrolled"]},
+        "Footer": {"variants": ["default", "minimal"], "states": ["default"]},
+        "DashboardStat": {"variants": ["default", "trend", "compact"], "states": ["default", "loading"]},
+        "Skeleton": {"variants": ["text", "circle", "rectangle"], "states": ["default", "animated"]},
+        "Search": {"variants": ["default", "with-filters"], "states": ["default", "focus", "loading", "empty"]},
+        "Breadcrumb": {"variants": ["default", "compact"], "states": ["default", "active"]},
+        "PricingTable": {"variants": ["default", "highlighted"], "states": ["default", "selected"]},
+        "Badge": {"variants": ["default", "success", "warning", "error", "info"], "states": ["default"]},
+        "Tooltip": {"variants": ["top", "bottom", "left", "right"], "states": ["default", "visible"]},
+        "Accordion": {"variants": ["default", "bordered"], "states": ["default", "expanded", "collapsed", "disabled"]},
+        "Testimonial": {"variants": ["default", "card", "quote"], "states": ["default"]},
+        "Avatar": {"variants": ["circle", "square"], "states": ["default", "loading", "fallback"]}
+    })
 
     # Design philosophy by industry
-    PHILOSOPHY_BY_INDUSTRY: Dict[str, str] = {
+    PHILOSOPHY_BY_INDUSTRY: Mapping[str, str] = MappingProxyType({
         "healthcare": "utility-first",
         "finance": "utility-first",
         "enterprise": "utility-first",
@@ -139,10 +182,10 @@ class KnowledgeBase:
         "marketing": "brand-led",
         "consumer": "brand-led",
         "education": "component-first"
-    }
+    })
 
     # Density preferences by industry
-    DENSITY_BY_INDUSTRY: Dict[str, str] = {
+    DENSITY_BY_INDUSTRY: Mapping[str, str] = MappingProxyType({
         "healthcare": "spacious",
         "finance": "spacious",
         "enterprise": "spacious",
@@ -152,10 +195,10 @@ class KnowledgeBase:
         "marketing": "spacious",
         "consumer": "balanced",
         "education": "balanced"
-    }
+    })
 
     # Warmth preferences by industry
-    WARMTH_BY_INDUSTRY: Dict[str, int] = {
+    WARMTH_BY_INDUSTRY: Mapping[str, int] = MappingProxyType({
         "healthcare": 4,  # Professional but approachable
         "finance": 3,  # Conservative
         "enterprise": 3,  # Professional
@@ -165,10 +208,10 @@ class KnowledgeBase:
         "marketing": 8,  # Energetic
         "consumer": 7,  # Warm and approachable
         "education": 6  # Friendly
-    }
+    })
 
     # Clarity requirements by industry
-    CLARITY_BY_INDUSTRY: Dict[str, int] = {
+    CLARITY_BY_INDUSTRY: Mapping[str, int] = MappingProxyType({
         "healthcare": 10,  # Critical for medical information
         "finance": 10,  # Critical for financial data
         "enterprise": 9,  # High clarity needed
@@ -178,10 +221,10 @@ class KnowledgeBase:
         "marketing": 7,  # Can be more creative
         "consumer": 8,  # Important for usability
         "education": 9  # Learning requires clarity
-    }
+    })
 
     # Speed requirements by industry
-    SPEED_BY_INDUSTRY: Dict[str, int] = {
+    SPEED_BY_INDUSTRY: Mapping[str, int] = MappingProxyType({
         "healthcare": 9,  # Fast access to critical info
         "finance": 9,  # Quick transactions
         "enterprise": 8,  # Efficient workflows
@@ -191,18 +234,18 @@ class KnowledgeBase:
         "marketing": 6,  # Can prioritize visuals
         "consumer": 7,  # Good UX but not critical
         "education": 7  # Balanced
-    }
+    })
 
     # Brand trait conflicts (traits that shouldn't be used together)
-    TRAIT_CONFLICTS: Dict[str, List[str]] = {
-        "clinical": ["playful", "bold"],
-        "professional": ["playful"],
-        "minimal": ["bold"],
-        "playful": ["clinical", "professional"]
-    }
+    TRAIT_CONFLICTS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+        "clinical": ("playful", "bold"),
+        "professional": ("playful",),
+        "minimal": ("bold",),
+        "playful": ("clinical", "professional")
+    })
 
     # Industry-specific accessibility requirements
-    ACCESSIBILITY_REQUIREMENTS: Dict[str, List[str]] = {
+    ACCESSIBILITY_REQUIREMENTS: Mapping[str, List[str]] = MappingProxyType({
         "healthcare": ["WCAG 2.1 AAA", "High contrast", "Screen reader optimized"],
         "finance": ["WCAG 2.1 AA", "Keyboard navigation", "High contrast"],
         "enterprise": ["WCAG 2.1 AA", "Keyboard navigation"],
@@ -212,101 +255,239 @@ class KnowledgeBase:
         "marketing": ["WCAG 2.1 AA"],
         "consumer": ["WCAG 2.1 AA"],
         "education": ["WCAG 2.1 AA", "Screen reader optimized"]
-    }
+    })
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def detect_industry(product_idea: str) -> str:
         """Detect industry from product description."""
+        # Keywords match at the start of a word, so stems cover their inflections and
+        # compounds ("healthcare", "shopping", "application") but "restore" is not "store"
         idea_lower = product_idea.lower()
+        for industry, pattern in _INDUSTRY_PATTERNS:
+            if pattern.search(idea_lower):
+                return industry
         
-        # Healthcare keywords
-        if any(kw in idea_lower for kw in ["health", "medical", "patient", "clinic", "hospital", "doctor", "nurse", "diagnosis", "treatment"]):
-            return Industry.HEALTHCARE.value
-        
-        # Finance keywords
-        if any(kw in idea_lower for kw in ["finance", "banking", "payment", "transaction", "investment", "trading", "wallet", "credit", "loan"]):
-            return Industry.FINANCE.value
-        
-        # E-commerce keywords
-        if any(kw in idea_lower for kw in ["shop", "store", "cart", "checkout", "product", "inventory", "retail", "ecommerce", "e-commerce", "purchase", "buy"]):
-            return Industry.ECOMMERCE.value
-        
-        # SaaS keywords
-        if any(kw in idea_lower for kw in ["saas", "software", "platform", "tool", "app", "dashboard", "analytics", "crm", "management"]):
-            if "dashboard" in idea_lower or "analytics" in idea_lower:
-                return Industry.DASHBOARD.value
-            return Industry.SAAS.value
-        
-        # Education keywords
-        if any(kw in idea_lower for kw in ["education", "learning", "course", "student", "teacher", "school", "university", "tutorial", "lesson"]):
-            return Industry.EDUCATION.value
-        
-        # Marketing keywords
-        if any(kw in idea_lower for kw in ["marketing", "landing", "campaign", "promotion", "advertising", "brand", "social media"]):
-            return Industry.MARKETING.value
-        
-        # Enterprise keywords
-        if any(kw in idea_lower for kw in ["enterprise", "b2b", "business", "corporate", "organization", "company"]):
-            return Industry.ENTERPRISE.value
-        
-        # Consumer keywords
-        if any(kw in idea_lower for kw in ["consumer", "b2c", "user", "personal", "individual"]):
-            return Industry.CONSUMER.value
-        
-        return Industry.UNKNOWN.value
+        return _UNKNOWN
 
     @staticmethod
-    def get_industry_color_suggestions(industry: str) -> Optional[Dict[str, str]]:
-        """Get color suggestions for an industry."""
-        return KnowledgeBase.INDUSTRY_COLORS.get(industry)
+    def get_component_spec(component: str) -> Optional[Dict[str, List[str]]]:
+        """Get variants and states for a specialized component."""
+        return _COMPONENT_SPECS.get(component)
 
     @staticmethod
-    def get_components_for_industry(industry: str) -> List[str]:
-        """Get recommended components for an industry."""
-        return KnowledgeBase.COMPONENT_BY_INDUSTRY.get(industry, [])
+    def has_complete_coverage(industry: str) -> bool:
+        """Check whether the knowledge base fully specifies an industry's component inventory."""
+        return industry in _COMPLETE_COVERAGE_INDUSTRIES
 
     @staticmethod
     def get_component_dependencies(component: str) -> List[str]:
         """Get dependencies for a component."""
-        return KnowledgeBase.COMPONENT_DEPENDENCIES.get(component, [])
+        return _COMPONENT_DEPENDENCIES.get(component, [])
+
+    @staticmethod
+    def get_transitive_dependencies(component: str) -> Tuple[str, ...]:
+        """Get every component a component depends on, directly or indirectly, in discovery order."""
+        return _TRANSITIVE_DEPENDENCIES.get(component, ())
+
+    @staticmethod
+    def get_profile(industry: str) -> IndustryProfile:
+        """Get the full knowledge base profile for an industry."""
+        return _industry_profiles().get(industry, _DEFAULT_PROFILE)
+
+    @staticmethod
+    def get_industry_color_suggestions(industry: str) -> Optional[Dict[str, str]]:
+        """Get color suggestions for an industry."""
+        colors = KnowledgeBase.get_profile(industry).colors
+        return dict(colors) if colors is not None else None
+
+    @staticmethod
+    def get_components_for_industry(industry: str) -> List[str]:
+        """Get recommended components for an industry."""
+        return list(KnowledgeBase.get_profile(industry).components)
 
     @staticmethod
     def get_philosophy_for_industry(industry: str) -> str:
         """Get design philosophy for an industry."""
-        return KnowledgeBase.PHILOSOPHY_BY_INDUSTRY.get(industry, "component-first")
+        return KnowledgeBase.get_profile(industry).philosophy
 
     @staticmethod
     def get_density_for_industry(industry: str) -> str:
         """Get density preference for an industry."""
-        return KnowledgeBase.DENSITY_BY_INDUSTRY.get(industry, "balanced")
+        return KnowledgeBase.get_profile(industry).density
 
     @staticmethod
     def get_warmth_for_industry(industry: str) -> int:
         """Get warmth preference for an industry."""
-        return KnowledgeBase.WARMTH_BY_INDUSTRY.get(industry, 5)
+        return KnowledgeBase.get_profile(industry).warmth
 
     @staticmethod
     def get_clarity_for_industry(industry: str) -> int:
         """Get clarity requirement for an industry."""
-        return KnowledgeBase.CLARITY_BY_INDUSTRY.get(industry, 8)
+        return KnowledgeBase.get_profile(industry).clarity
 
     @staticmethod
     def get_speed_for_industry(industry: str) -> int:
         """Get speed requirement for an industry."""
-        return KnowledgeBase.SPEED_BY_INDUSTRY.get(industry, 7)
+        return KnowledgeBase.get_profile(industry).speed
+
+    @staticmethod
+    def get_accessibility_requirements(industry: str) -> List[str]:
+        """Get accessibility requirements for an industry."""
+        return list(KnowledgeBase.get_profile(industry).accessibility)
+
+    @staticmethod
+    def get_industry_context(industry: str) -> Dict:
+        """Get philosophy, density, warmth, clarity and speed for an industry in one lookup."""
+        return dict(_industry_contexts().get(industry, _DEFAULT_INDUSTRY_CONTEXT))
 
     @staticmethod
     def check_trait_conflicts(traits: List[str]) -> List[str]:
         """Check for conflicting brand traits."""
-        conflicts = []
-        for trait in traits:
-            conflicting = KnowledgeBase.TRAIT_CONFLICTS.get(trait, [])
-            for conflict in conflicting:
-                if conflict in traits:
-                    conflicts.append(f"{trait} conflicts with {conflict}")
-        return conflicts
+        return list(KnowledgeBase._trait_conflicts(tuple(traits)))
 
     @staticmethod
-    def get_accessibility_requirements(industry: str) -> List[str]:
-        """Get accessibility requirements for an industry."""
-        return KnowledgeBase.ACCESSIBILITY_REQUIREMENTS.get(industry, ["WCAG 2.1 AA"])
+    @functools.lru_cache(maxsize=256)
+    def _trait_conflicts(traits: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Cached conflict check over a hashable trait tuple."""
+        trait_set = frozenset(traits)
+        return tuple(
+            f"{trait} conflicts with {conflict}"
+            for trait in traits
+            for conflict in KnowledgeBase.TRAIT_CONFLICTS.get(trait, ())
+            if conflict in trait_set
+        )
+
+
+# Module-level aliases for the tables read on every call; a global lookup skips the class attribute walk
+_COMPONENT_SPECS = KnowledgeBase.COMPONENT_SPECS
+_COMPONENT_DEPENDENCIES = KnowledgeBase.COMPONENT_DEPENDENCIES
+
+# Industries whose every industry-specific component (beyond the core set) has variants/states
+# in COMPONENT_SPECS, so AI selection adds nothing
+_COMPLETE_COVERAGE_INDUSTRIES: FrozenSet[str] = frozenset(
+    industry
+    for industry, components in KnowledgeBase.COMPONENT_BY_INDUSTRY.items()
+    if all(component in _COMPONENT_SPECS for component in components if component not in KnowledgeBase.CORE_COMPONENTS)
+)
+
+def _dependency_closure(component: str) -> Tuple[str, ...]:
+    # Depth-first from one root; the visited set stops cycles, and every member of a
+    # cycle is reached because nothing is memoized part-way through another root.
+    closure: Dict[str, None] = {component: None}
+    stack = [iter(_COMPONENT_DEPENDENCIES.get(component, ()))]
+    while stack:
+        dep = next(stack[-1], None)
+        if dep is None:
+            stack.pop()
+        elif dep not in closure:
+            closure[dep] = None
+            stack.append(iter(_COMPONENT_DEPENDENCIES.get(dep, ())))
+    del closure[component]
+    return tuple(closure)
+
+
+# Dependency closure of every component, resolved once
+_TRANSITIVE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    component: _dependency_closure(component) for component in _COMPONENT_DEPENDENCIES
+}
+
+# Profile for industries without an entry in the tables above
+_DEFAULT_PROFILE = IndustryProfile(
+    philosophy="component-first",
+    density="balanced",
+    warmth=5,
+    clarity=8,
+    speed=7,
+    colors=None,
+    components=(),
+    accessibility=("WCAG 2.1 AA",)
+)
+
+
+def _read_only(mapping: Optional[Dict]) -> Optional[Mapping]:
+    return MappingProxyType(mapping) if mapping is not None else None
+
+
+def _build_profile(industry: str) -> IndustryProfile:
+    return IndustryProfile(
+        philosophy=KnowledgeBase.PHILOSOPHY_BY_INDUSTRY.get(industry, _DEFAULT_PROFILE.philosophy),
+        density=KnowledgeBase.DENSITY_BY_INDUSTRY.get(industry, _DEFAULT_PROFILE.density),
+        warmth=KnowledgeBase.WARMTH_BY_INDUSTRY.get(industry, _DEFAULT_PROFILE.warmth),
+        clarity=KnowledgeBase.CLARITY_BY_INDUSTRY.get(industry, _DEFAULT_PROFILE.clarity),
+        speed=KnowledgeBase.SPEED_BY_INDUSTRY.get(industry, _DEFAULT_PROFILE.speed),
+        colors=_read_only(KnowledgeBase.INDUSTRY_COLORS.get(industry)),
+        components=tuple(KnowledgeBase.COMPONENT_BY_INDUSTRY.get(industry, _DEFAULT_PROFILE.components)),
+        accessibility=tuple(KnowledgeBase.ACCESSIBILITY_REQUIREMENTS.get(industry, _DEFAULT_PROFILE.accessibility))
+    )
+
+
+@functools.cache
+def _industry_profiles() -> Mapping[str, IndustryProfile]:
+    """Industry profiles, resolved from the per-field tables on first use."""
+    return MappingProxyType({
+        industry: _build_profile(industry)
+        for industry in (
+            KnowledgeBase.PHILOSOPHY_BY_INDUSTRY.keys()
+            | KnowledgeBase.DENSITY_BY_INDUSTRY.keys()
+            | KnowledgeBase.WARMTH_BY_INDUSTRY.keys()
+            | KnowledgeBase.CLARITY_BY_INDUSTRY.keys()
+            | KnowledgeBase.SPEED_BY_INDUSTRY.keys()
+            | KnowledgeBase.INDUSTRY_COLORS.keys()
+            | KnowledgeBase.COMPONENT_BY_INDUSTRY.keys()
+            | KnowledgeBase.ACCESSIBILITY_REQUIREMENTS.keys()
+        )
+    })
+
+
+def _context(profile: IndustryProfile) -> Dict:
+    return {
+        "philosophy": profile.philosophy,
+        "density": profile.density,
+        "warmth": profile.warmth,
+        "clarity": profile.clarity,
+        "speed": profile.speed
+    }
+
+
+# Numeric/style slice of each profile, as consumed by IndustryContext and the prompts
+_DEFAULT_INDUSTRY_CONTEXT: Dict = _context(_DEFAULT_PROFILE)
+
+
+@functools.cache
+def _industry_contexts() -> Mapping[str, Dict]:
+    return MappingProxyType({industry: _context(profile) for industry, profile in _industry_profiles().items()})
+
+
+_UNKNOWN = Industry.UNKNOWN.value
+
+# Industry keywords in detection priority order. Dashboard terms sit just ahead of the
+# remaining SaaS terms so a SaaS product mentioning dashboards/analytics is a dashboard.
+_INDUSTRY_KEYWORD_LISTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (Industry.HEALTHCARE.value, ("health", "telehealth", "telemedicine", "medical", "patient", "clinic", "hospital", "doctor", "nurse", "diagnosis", "treatment")),
+    (Industry.FINANCE.value, ("finance", "banking", "payment", "transaction", "investment", "trading", "wallet", "credit", "loan")),
+    (Industry.ECOMMERCE.value, ("shop", "store", "cart", "checkout", "product", "inventory", "retail", "ecommerce", "e-commerce", "purchase", "buy")),
+    (Industry.DASHBOARD.value, ("dashboard", "analytics")),
+    (Industry.SAAS.value, ("saas", "software", "platform", "tool", "app", "crm", "management")),
+    (Industry.EDUCATION.value, ("education", "learning", "course", "student", "teacher", "school", "university", "tutorial", "lesson")),
+    (Industry.MARKETING.value, ("marketing", "landing", "campaign", "promotion", "advertising", "brand", "social media")),
+    (Industry.ENTERPRISE.value, ("enterprise", "b2b", "business", "corporate", "organization", "company")),
+    (Industry.CONSUMER.value, ("consumer", "b2c", "user", "personal", "individual")),
+)
+
+# Keywords that also count inside compound words ("bookstore", "webshop", "mHealth",
+# "preschool", "superusers"); every other keyword must start a word.
+_COMPOUND_KEYWORDS: FrozenSet[str] = frozenset({"store", "shop", "health", "school", "user"})
+
+
+def _keyword_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    anchored = [re.escape(kw) for kw in keywords if kw not in _COMPOUND_KEYWORDS]
+    anywhere = [re.escape(kw) for kw in keywords if kw in _COMPOUND_KEYWORDS]
+    alternatives = [r"\b(?:" + "|".join(anchored) + ")"] + anywhere
+    return re.compile("|".join(alternatives))
+
+
+# One alternation per industry, tried in priority order
+_INDUSTRY_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+    (industry, _keyword_pattern(keywords)) for industry, keywords in _INDUSTRY_KEYWORD_LISTS
+)
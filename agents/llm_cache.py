@@ -0,0 +1,102 @@
+"""In-process response cache for agent LLM calls with exact and near-duplicate matching."""
+
+import copy
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Cosine similarity required for a near-duplicate product description to reuse a response
+SIMILARITY_THRESHOLD = 0.95
+MAX_ENTRIES = 512
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# A bag of words can't tell "buying, not selling" from "selling, not buying", so prompts
+# containing any of these only ever match exactly ("t" is what "don't"/"isn't" leave behind)
+_NEGATIONS = frozenset({"not", "no", "never", "without", "except", "nor", "non", "t"})
+
+# (model, prompt_hash) -> (scope, embedding, response)
+_entries: "OrderedDict[Tuple[str, str], Tuple[str, Optional[Dict[str, float]], dict]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different prompts share a key."""
+    return " ".join(text.lower().split())
+
+
+def prompt_hash(*parts: str) -> str:
+    """Exact-match key for a prompt built from one or more parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(normalize(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def embed(text: str) -> Dict[str, float]:
+    """Unit-length bag-of-words vector used for near-duplicate lookups; empty for negated text."""
+    counts = Counter(_WORD_RE.findall(text.lower()))
+    if not _NEGATIONS.isdisjoint(counts):
+        return {}
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    if not norm:
+        return {}
+    return {word: count / norm for word, count in counts.items()}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(word, 0.0) for word, weight in a.items())
+
+
+def _similar_length(a: Dict[str, float], b: Dict[str, float]) -> bool:
+    # Vocabulary sizes within 10% (at least one word), so a short prompt can't stand in for a long one
+    return abs(len(a) - len(b)) <= max(1, max(len(a), len(b)) // 10)
+
+
+def lookup(model: str, key: str, embedding: Optional[Dict[str, float]] = None, scope: str = "") -> Optional[dict]:
+    """Return a cached response by exact key, then by embedding similarity within scope."""
+    with _lock:
+        entry = _entries.get((model, key))
+        if entry is not None:
+            _entries.move_to_end((model, key))
+            return copy.deepcopy(entry[2])
+
+        if not embedding:
+            return None
+
+        best_key = None
+        best_score = SIMILARITY_THRESHOLD
+        for entry_key, (entry_scope, entry_embedding, _) in _entries.items():
+            if entry_key[0] != model or entry_scope != scope or not entry_embedding:
+                continue
+            if not _similar_length(embedding, entry_embedding):
+                continue
+            score = _cosine(embedding, entry_embedding)
+            if score >= best_score:
+                best_key, best_score = entry_key, score
+
+        if best_key is None:
+            return None
+        _entries.move_to_end(best_key)
+        return copy.deepcopy(_entries[best_key][2])
+
+
+def store(model: str, key: str, response: dict, embedding: Optional[Dict[str, float]] = None, scope: str = "") -> None:
+    """Store a parsed LLM response."""
+    with _lock:
+        _entries[(model, key)] = (scope, embedding, copy.deepcopy(response))
+        _entries.move_to_end((model, key))
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop all cached responses."""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,37 @@
+"""Shared LLM call helpers for the agents."""
+
+import importlib.util
+import orjson
+
+
+def _litellm():
+    """
+    Import litellm on first use and attach the shared connection pool.
+
+    litellm pulls in every provider client, so keeping it out of module import
+    saves cold-start time on the rule-based path, which never calls an LLM.
+    """
+    import litellm
+    
+    # One keep-alive connection pool shared by every agent, so back-to-back calls
+    # reuse connections instead of paying a TCP/TLS handshake each time; concurrent
+    # calls multiplex over one HTTP/2 connection when the optional h2 package is installed
+    if litellm.client_session is None:
+        import httpx
+        litellm.client_session = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=httpx.Timeout(litellm.request_timeout)
+        )
+    return litellm
+
+
+def completion(**kwargs):
+    """Call litellm.completion through the shared connection pool."""
+    return _litellm().completion(**kwargs)
+
+
+def complete_json(**kwargs) -> dict:
+    """Run a JSON-mode completion and return the parsed object."""
+    response = completion(**kwargs)
+    return orjson.loads(response.choices[0].message.content)
@@ -1,36 +1,19 @@
 """Sophisticated prompts for agent reasoning with few-shot examples and chain-of-thought."""
 
-from typing import Dict, Optional
-from models import DesignSystemInput, DesignPrinciples
+import functools
+from typing import Callable, Dict, List, Optional, Tuple
+from models import DesignSystemInput, DesignPrinciples, enum_values
 
 
-class PromptTemplates:
-    """Centralized prompt templates with few-shot examples."""
+_NOT_PROVIDED = "Not provided - you must infer"
 
-    @staticmethod
-    def design_strategist_prompt(input_data: DesignSystemInput, industry: str, industry_context: Dict) -> str:
-        """Generate sophisticated prompt for Design Strategist with chain-of-thought reasoning."""
-        
-        users_provided = [u.value for u in input_data.target_users] if input_data.target_users else []
-        traits_provided = [t.value for t in input_data.brand_traits] if input_data.brand_traits else []
-        platforms_provided = [p.value for p in input_data.platforms] if input_data.platforms else []
-        
-        return f"""You are a senior Design Strategist with 15+ years of experience creating design systems for Fortune 500 companies and startups.
+# Color prompt label indexed by warmth score (0-10)
+_WARMTH_LABEL = ("cool",) * 4 + ("neutral",) * 3 + ("warm",) * 4
 
-TASK: Analyze the product requirements and define core design principles that will guide the entire design system.
-
-PRODUCT DESCRIPTION: {input_data.product_idea}
-DETECTED INDUSTRY: {industry}
-PROVIDED TARGET USERS: {users_provided if users_provided else "Not provided - you must infer"}
-PROVIDED BRAND TRAITS: {traits_provided if traits_provided else "Not provided - you must infer"}
-PROVIDED PLATFORMS: {platforms_provided if platforms_provided else "Not provided - you must infer"}
+# Static prompt bodies, built once; the per-call parts are filled in with format_map
+_STRATEGIST_SYSTEM = """You are a senior Design Strategist with 15+ years of experience creating design systems for Fortune 500 companies and startups.
 
-INDUSTRY CONTEXT:
-- Typical philosophy: {industry_context.get('philosophy', 'component-first')}
-- Typical density: {industry_context.get('density', 'balanced')}
-- Typical warmth: {industry_context.get('warmth', 5)}/10
-- Typical clarity: {industry_context.get('clarity', 8)}/10
-- Typical speed: {industry_context.get('speed', 7)}/10
+TASK: Analyze the product requirements and define core design principles that will guide the entire design system.
 
 REASONING PROCESS:
 1. First, analyze the product description to understand:
@@ -57,7 +40,7 @@ REASONING PROCESS:
    - How confident are you in the inferred platforms?
 
 OUTPUT FORMAT (JSON only):
-{{
+{
   "clarity": <1-10>,
   "density": "<dense|balanced|spacious>",
   "warmth": <1-10>,
@@ -67,13 +50,13 @@ OUTPUT FORMAT (JSON only):
   "inferred_traits": ["<trait>", ...],
   "inferred_platforms": ["<platform>", ...],
   "reasoning": "<2-3 sentence explanation of your decisions>",
-  "confidence": {{
+  "confidence": {
     "users": <0.0-1.0>,
     "traits": <0.0-1.0>,
     "platforms": <0.0-1.0>
-  }},
+  },
   "overrides": ["<any user inputs you overrode and why>"]
-}}
+}
 
 IMPORTANT:
 - If user provided values conflict with industry best practices, override them and explain why
@@ -81,25 +64,28 @@ IMPORTANT:
 - Confidence scores should reflect how certain you are based on the product description
 - Return ONLY valid JSON, no markdown, no explanations outside JSON"""
 
-    @staticmethod
-    def visual_identity_color_prompt(principles: DesignPrinciples, industry: str, industry_colors: Optional[Dict], product_idea: str = "") -> str:
-        """Generate sophisticated prompt for color generation with diversity requirements."""
-        
-        color_suggestion = ""
-        if industry_colors:
-            color_suggestion = f"""
-INDUSTRY COLOR GUIDANCE:
-- Suggested primary: {industry_colors.get('primary')}
-- Suggested accent: {industry_colors.get('accent')}
-- Rationale: {industry_colors.get('rationale')}
+# Ordered from most to least stable (industry, then user inputs, then the description)
+# so consecutive calls share as long a prefix as possible
+_STRATEGIST_INDUSTRY = """DETECTED INDUSTRY: {industry}
 
-You may use these as inspiration but create a unique palette that fits the specific product context."""
-        
-        return f"""You are a senior UI/UX Designer specializing in color systems for digital products.
+INDUSTRY CONTEXT:
+- Typical philosophy: {philosophy}
+- Typical density: {density}
+- Typical warmth: {warmth}/10
+- Typical clarity: {clarity}/10
+- Typical speed: {speed}/10
 
-TASK: Generate a professional, accessible color palette that aligns with the design principles and product context.
+"""
+
+_STRATEGIST_INPUTS = """PROVIDED TARGET USERS: {users}
+PROVIDED BRAND TRAITS: {traits}
+PROVIDED PLATFORMS: {platforms}
 
-PRODUCT CONTEXT: {product_idea[:200] if product_idea else "Not provided"}
+PRODUCT DESCRIPTION: {product_idea}"""
+
+_COLOR_SYSTEM = """You are a senior UI/UX Designer specializing in color systems for digital products.
+
+TASK: Generate a professional, accessible color palette that aligns with the design principles and product context.
 
 IMPORTANT FOR COLOR DIVERSITY:
 - Generate a UNIQUE color that is SPECIFIC to this exact product description
@@ -107,15 +93,6 @@ IMPORTANT FOR COLOR DIVERSITY:
 - Use the product context to create a distinctive color palette
 - Avoid default/common colors - be creative and specific
 
-DESIGN PRINCIPLES:
-- Philosophy: {principles.philosophy}
-- Warmth: {principles.warmth}/10 ({'warm' if principles.warmth >= 7 else 'cool' if principles.warmth <= 3 else 'neutral'})
-- Density: {principles.density}
-- Clarity: {principles.clarity}/10 (high clarity requires high contrast)
-
-INDUSTRY: {industry}
-{color_suggestion}
-
 REASONING PROCESS:
 1. Consider the warmth score:
    - Warmth 1-3: Cool colors (blues, grays) - professional, clinical
@@ -152,28 +129,28 @@ REASONING PROCESS:
    - Generate colors that are naturally accessible, not colors that need adjustment
 
 OUTPUT FORMAT (JSON only):
-{{
+{
   "primary_recommendations": [
-    {{
+    {
       "primary": "<hex_code>",
       "secondary": "<hex_code>",
       "rationale": "<brief explanation of why this combination works for the product>"
-    }},
-    {{
+    },
+    {
       "primary": "<hex_code>",
       "secondary": "<hex_code>",
       "rationale": "<brief explanation of why this combination works for the product>"
-    }},
-    {{
+    },
+    {
       "primary": "<hex_code>",
       "secondary": "<hex_code>",
       "rationale": "<brief explanation of why this combination works for the product>"
-    }}
+    }
   ],
   "neutral": "<hex_code>",
   "accent": "<hex_code>",
   "overall_rationale": "<2-3 sentence explanation of color choices and how they support the design principles>"
-}}
+}
 
 IMPORTANT:
 - Generate UNIQUE, DISTINCTIVE colors for this specific product (not generic palettes)
@@ -182,18 +159,31 @@ IMPORTANT:
 - Explain how colors support the design principles and make this product stand out
 - Return ONLY valid JSON"""
 
-    @staticmethod
-    def component_architect_prompt(principles: DesignPrinciples, product_context: str, industry: str, base_components: list) -> str:
-        """Generate sophisticated prompt for component selection."""
-        
-        return f"""You are a Design Systems Architect with expertise in component design and information architecture.
+_COLOR_GUIDANCE = """
+INDUSTRY COLOR GUIDANCE:
+- Suggested primary: {primary}
+- Suggested accent: {accent}
+- Rationale: {rationale}
 
-TASK: Determine the complete component inventory needed for this product, including specialized components beyond the base set.
+You may use these as inspiration but create a unique palette that fits the specific product context."""
+
+# Principles and industry repeat across products, so they lead and the product context comes last
+_COLOR_USER = """DESIGN PRINCIPLES:
+- Philosophy: {philosophy}
+- Warmth: {warmth}/10 ({warmth_label})
+- Density: {density}
+- Clarity: {clarity}/10 (high clarity requires high contrast)
 
-PRODUCT CONTEXT: {product_context}
 INDUSTRY: {industry}
-DESIGN PHILOSOPHY: {principles.philosophy}
-BASE COMPONENTS (already included): {', '.join([c.name for c in base_components])}
+{color_suggestion}
+
+PRODUCT CONTEXT: {product_context}"""
+
+_ARCHITECT_SYSTEM = """You are a Design Systems Architect with expertise in component design and information architecture.
+
+TASK: Determine the complete component inventory needed for this product, including specialized components beyond the base set.
+
+BASE COMPONENTS (already included): {base_components}
 
 REASONING PROCESS:
 1. Analyze the product context:
@@ -234,15 +224,135 @@ IMPORTANT:
 - Ensure completeness for the product type
 - Return ONLY valid JSON"""
 
+# Product context goes last since it differs on every call
+_ARCHITECT_USER = """INDUSTRY: {industry}
+DESIGN PHILOSOPHY: {philosophy}
+PRODUCT CONTEXT: {product_context}"""
+
+
+@functools.lru_cache(maxsize=32)
+def _strategist_industry_section(industry: str, context: Tuple) -> str:
+    """Render the industry part of the strategist message once per industry; it never depends on the input."""
+    context = dict(context)
+    return _STRATEGIST_INDUSTRY.format_map({
+        "industry": industry,
+        "philosophy": context.get("philosophy", "component-first"),
+        "density": context.get("density", "balanced"),
+        "warmth": context.get("warmth", 5),
+        "clarity": context.get("clarity", 8),
+        "speed": context.get("speed", 7)
+    })
+
+
+@functools.lru_cache(maxsize=256)
+def _strategist_user_message(product_idea: str, industry: str, context: Tuple, users: Tuple[str, ...], traits: Tuple[str, ...], platforms: Tuple[str, ...]) -> str:
+    """Render the strategist user message; retries within a run reuse the string."""
+    return _strategist_industry_section(industry, context) + _STRATEGIST_INPUTS.format_map({
+        "users": list(users) if users else _NOT_PROVIDED,
+        "traits": list(traits) if traits else _NOT_PROVIDED,
+        "platforms": list(platforms) if platforms else _NOT_PROVIDED,
+        "product_idea": product_idea
+    })
+
+
+@functools.lru_cache(maxsize=32)
+def _color_guidance_section(colors: Tuple) -> str:
+    """Render the industry color guidance once per industry palette."""
+    colors = dict(colors)
+    return _COLOR_GUIDANCE.format_map({
+        "primary": colors.get("primary"),
+        "accent": colors.get("accent"),
+        "rationale": colors.get("rationale")
+    })
+
+
+@functools.lru_cache(maxsize=16)
+def _architect_system_prefix(base_names: Tuple[str, ...]) -> str:
+    return _ARCHITECT_SYSTEM.format_map({"base_components": ", ".join(base_names)})
+
+
+class PromptTemplates:
+    """Centralized prompt templates with few-shot examples."""
+
+    @staticmethod
+    def cached_messages(model: str, system_prefix: str, user_message: str) -> List[Dict]:
+        """Build chat messages with the static prompt prefix first so providers can cache it.
+
+        Anthropic needs an explicit cache_control marker; OpenAI and Gemini cache
+        matching prefixes automatically as long as the static block leads.
+        """
+        if model.startswith("anthropic/") or "claude" in model:
+            system_content = [{"type": "text", "text": system_prefix, "cache_control": {"type": "ephemeral"}}]
+        else:
+            system_content = system_prefix
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_message}
+        ]
+
+    @staticmethod
+    def design_strategist_prompt(input_data: DesignSystemInput, industry: str, industry_context: Dict) -> Tuple[str, str]:
+        """Generate sophisticated prompt for Design Strategist with chain-of-thought reasoning.
+
+        Returns (system_prefix, user_message); the prefix is identical across calls.
+        """
+        user_message = _strategist_user_message(
+            input_data.product_idea,
+            industry,
+            tuple(industry_context.items()),
+            tuple(enum_values(input_data.target_users)),
+            tuple(enum_values(input_data.brand_traits)),
+            tuple(enum_values(input_data.platforms))
+        )
+        
+        return _STRATEGIST_SYSTEM, user_message
+
+    @staticmethod
+    def visual_identity_color_prompt(principles: DesignPrinciples, industry: str, industry_colors: Optional[Dict], product_idea: str = "") -> Tuple[str, str]:
+        """Generate sophisticated prompt for color generation with diversity requirements.
+
+        Returns (system_prefix, user_message); the prefix is identical across calls.
+        """
+        
+        color_suggestion = _color_guidance_section(tuple(industry_colors.items())) if industry_colors else ""
+        
+        return _COLOR_SYSTEM, _COLOR_USER.format_map({
+            "product_context": product_idea[:200] if product_idea else "Not provided",
+            "philosophy": principles.philosophy,
+            "warmth": principles.warmth,
+            "warmth_label": _WARMTH_LABEL[max(0, min(10, principles.warmth))],
+            "density": principles.density,
+            "clarity": principles.clarity,
+            "industry": industry,
+            "color_suggestion": color_suggestion
+        })
+
+    @staticmethod
+    def component_architect_prompt(principles: DesignPrinciples, product_context: str, industry: str, base_components: list) -> Tuple[str, str]:
+        """Generate sophisticated prompt for component selection.
+
+        Returns (system_prefix, user_message); the prefix only depends on the base component set.
+        """
+        system_prefix = _architect_system_prefix(tuple(c.name for c in base_components))
+        user_message = _ARCHITECT_USER.format_map({
+            "industry": industry,
+            "philosophy": principles.philosophy,
+            "product_context": product_context
+        })
+        
+        return system_prefix, user_message
+
     @staticmethod
     def validation_prompt(agent_output: str, validation_type: str, context: Dict) -> str:
         """Generate prompt for validation."""
-        
-        if validation_type == "color_accessibility":
-            return f"""Validate these colors for WCAG 2.1 AA accessibility:
+        render = _VALIDATION_PROMPTS.get(validation_type)
+        return render(context) if render else ""
+
 
-PRIMARY COLOR: {context.get('primary')}
-NEUTRAL COLOR: {context.get('neutral')}
+_COLOR_ACCESSIBILITY_TEMPLATE = """Validate these colors for WCAG 2.1 AA accessibility:
+
+PRIMARY COLOR: {primary}
+NEUTRAL COLOR: {neutral}
 
 Check:
 1. Primary-500 on white background: contrast ratio >= 4.5:1
@@ -251,13 +361,12 @@ Check:
 4. All semantic colors (success, error, warning) meet contrast requirements
 
 Return JSON with validation results and any issues found."""
-        
-        elif validation_type == "component_completeness":
-            return f"""Validate component inventory for completeness:
 
-PRODUCT TYPE: {context.get('product_type')}
-INDUSTRY: {context.get('industry')}
-COMPONENTS: {context.get('components')}
+_COMPONENT_COMPLETENESS_TEMPLATE = """Validate component inventory for completeness:
+
+PRODUCT TYPE: {product_type}
+INDUSTRY: {industry}
+COMPONENTS: {components}
 
 Check:
 1. Are all necessary components for this product type included?
@@ -265,5 +374,16 @@ Check:
 3. Are there any missing critical components?
 
 Return JSON with validation results."""
-        
-        return ""
+
+# validation_type -> prompt renderer; missing context keys render as None, as before
+_VALIDATION_PROMPTS: Dict[str, Callable[[Dict], str]] = {
+    "color_accessibility": lambda context: _COLOR_ACCESSIBILITY_TEMPLATE.format(
+        primary=context.get("primary"),
+        neutral=context.get("neutral")
+    ),
+    "component_completeness": lambda context: _COMPONENT_COMPLETENESS_TEMPLATE.format(
+        product_type=context.get("product_type"),
+        industry=context.get("industry"),
+        components=context.get("components")
+    ),
+}
@@ -1,9 +1,30 @@
 """Validation and quality assurance for agent outputs."""
 
 import colorsys
-from typing import Dict, List, Optional
+import functools
+from typing import Dict, Iterable, List, Optional
 from models import DesignTokens, DesignPrinciples, ComponentInventory, ValidationResult, ColorToken
+from agents.knowledge_base import KnowledgeBase
 
+# Relative luminance of white (#FFFFFF); every channel linearizes to exactly 1.0
+_WHITE_LUM = 1.0
+
+# Components whose absence is an error rather than a suggestion
+_CRITICAL_COMPONENTS = frozenset({"Button", "Input", "Select", "Modal", "Alert"})
+
+def _to_linear(c: float) -> float:
+    """Linear-light value of an sRGB channel in 0-1 (WCAG transfer function)."""
+    if c <= 0.03928:
+        return c / 12.92
+    return ((c + 0.055) / 1.055) ** 2.4
+
+# Linear-light value of every 8-bit sRGB channel value, indexed by byte
+_SRGB_LINEAR = tuple(_to_linear(i / 255.0) for i in range(256))
+
+def _color_value(colors_by_name: Dict[str, ColorToken], name: str) -> Optional[str]:
+    """Hex value of the named color token, or None if the palette doesn't have it."""
+    token = colors_by_name.get(name)
+    return token.value if token else None
 
 class Validator:
     """Validates agent outputs for consistency, accessibility, and quality."""
@@ -11,39 +32,52 @@ class Validator:
     @staticmethod
     def hex_to_rgb(hex_color: str) -> tuple:
         """Convert hex color to RGB tuple (0-1 range)."""
-        hex_color = hex_color.lstrip('#')
+        # Normalize first so "#FFFFFF" and "#ffffff" share a cache entry
+        return Validator._parse_hex(hex_color.lower().lstrip('#'))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _parse_hex(hex_color: str) -> tuple:
+        """Cached parse of a normalized (lowercase, no '#') hex color."""
         r = int(hex_color[0:2], 16) / 255.0
         g = int(hex_color[2:4], 16) / 255.0
         b = int(hex_color[4:6], 16) / 255.0
         return (r, g, b)
 
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def get_luminance(rgb: tuple) -> float:
         """Calculate relative luminance (WCAG formula)."""
+        return Validator.rgb_luminance(rgb)
+
+    @staticmethod
+    def rgb_luminance(rgb: tuple) -> float:
+        """Relative luminance (WCAG) without caching, for one-off colors."""
         r, g, b = rgb
-        
-        # Convert to linear RGB
-        def to_linear(c):
-            if c <= 0.03928:
-                return c / 12.92
-            return ((c + 0.055) / 1.055) ** 2.4
-        
-        r_linear = to_linear(r)
-        g_linear = to_linear(g)
-        b_linear = to_linear(b)
-        
-        # Calculate luminance
-        return 0.2126 * r_linear + 0.7152 * g_linear + 0.0722 * b_linear
+        return 0.2126 * _to_linear(r) + 0.7152 * _to_linear(g) + 0.0722 * _to_linear(b)
 
     @staticmethod
-    def get_contrast_ratio(color1: str, color2: str) -> float:
-        """Calculate contrast ratio between two colors (WCAG)."""
-        rgb1 = Validator.hex_to_rgb(color1)
-        rgb2 = Validator.hex_to_rgb(color2)
-        
-        lum1 = Validator.get_luminance(rgb1)
-        lum2 = Validator.get_luminance(rgb2)
-        
+    def get_hex_luminance(hex_color: str) -> float:
+        """Relative luminance (WCAG) of a hex color via the 8-bit linearization table."""
+        hex_color = hex_color.lstrip('#')
+        return (
+            0.2126 * _SRGB_LINEAR[int(hex_color[0:2], 16)]
+            + 0.7152 * _SRGB_LINEAR[int(hex_color[2:4], 16)]
+            + 0.0722 * _SRGB_LINEAR[int(hex_color[4:6], 16)]
+        )
+
+    @staticmethod
+    def get_luminances(hex_colors: Iterable[str]) -> Dict[str, float]:
+        """Relative luminance of each distinct hex color, parsed once per color."""
+        luminances = {}
+        for hex_color in hex_colors:
+            if hex_color not in luminances:
+                luminances[hex_color] = Validator.get_hex_luminance(hex_color)
+        return luminances
+
+    @staticmethod
+    def contrast_from_luminance(lum1: float, lum2: float) -> float:
+        """Contrast ratio (WCAG) between two already-computed luminances."""
         lighter = max(lum1, lum2)
         darker = min(lum1, lum2)
         
@@ -52,29 +86,61 @@ class Validator:
         
         return (lighter + 0.05) / (darker + 0.05)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def get_contrast_ratio(color1: str, color2: str) -> float:
+        """Calculate contrast ratio between two colors (WCAG)."""
+        lum1 = Validator.get_hex_luminance(color1)
+        lum2 = Validator.get_hex_luminance(color2)
+        return Validator.contrast_from_luminance(lum1, lum2)
+
+    @staticmethod
+    def contrast_on_white(hex_color: str) -> float:
+        """Contrast ratio (WCAG) of a color against white, computing only the color's luminance."""
+        return Validator.contrast_from_luminance(Validator.get_hex_luminance(hex_color), _WHITE_LUM)
+
+    @staticmethod
+    def build_color_table(tokens: DesignTokens) -> Dict:
+        """Semantic colors and the luminance of every color the accessibility checks compare."""
+        # Semantic colors are recognised by name prefix (success-*, error-*, ...) whatever their role
+        semantic_colors = {
+            "success": None,
+            "error": None,
+            "warning": None,
+            "info": None
+        }
+        
+        for color in tokens.colors:
+            role, dash, _ = color.name.partition("-")
+            if dash and role in semantic_colors:
+                semantic_colors[role] = color.value
+        
+        # Luminance of every color a check compares, computed once
+        colors_by_name = tokens.colors_by_name
+        tested = (_color_value(colors_by_name, "primary-500"), _color_value(colors_by_name, "neutral-50"), _color_value(colors_by_name, "neutral-700"), *semantic_colors.values())
+        return {
+            "semantic": semantic_colors,
+            "luminance": Validator.get_luminances(c for c in tested if c)
+        }
+
     @staticmethod
     def validate_color_accessibility(tokens: DesignTokens) -> ValidationResult:
         """Validate color tokens for WCAG 2.1 AA accessibility."""
         issues = []
         warnings = []
         
-        # Find primary-500 and neutral colors
-        primary_500 = None
-        neutral_50 = None
-        neutral_700 = None
-        white = "#FFFFFF"
+        table = Validator.build_color_table(tokens)
+        semantic_colors = table["semantic"]
+        luminance = table["luminance"]
         
-        for color in tokens.colors:
-            if color.name == "primary-500":
-                primary_500 = color.value
-            elif color.name == "neutral-50":
-                neutral_50 = color.value
-            elif color.name == "neutral-700":
-                neutral_700 = color.value
+        colors_by_name = tokens.colors_by_name
+        primary_500 = _color_value(colors_by_name, "primary-500")
+        neutral_50 = _color_value(colors_by_name, "neutral-50")
+        neutral_700 = _color_value(colors_by_name, "neutral-700")
         
         # Validate primary-500 on white (for buttons, links)
         if primary_500:
-            contrast = Validator.get_contrast_ratio(primary_500, white)
+            contrast = Validator.contrast_from_luminance(luminance[primary_500], _WHITE_LUM)
             if contrast < 4.5:
                 issues.append(f"Primary-500 ({primary_500}) on white has contrast ratio {contrast:.2f}, needs >= 4.5 for WCAG AA")
             elif contrast < 7.0:
@@ -82,37 +148,20 @@ class Validator:
         
         # Validate neutral-700 on white (for body text)
         if neutral_700:
-            contrast = Validator.get_contrast_ratio(neutral_700, white)
+            contrast = Validator.contrast_from_luminance(luminance[neutral_700], _WHITE_LUM)
             if contrast < 4.5:
                 issues.append(f"Neutral-700 ({neutral_700}) on white has contrast ratio {contrast:.2f}, needs >= 4.5 for WCAG AA")
         
         # Validate primary-500 on neutral-50 (for primary buttons on light backgrounds)
         if primary_500 and neutral_50:
-            contrast = Validator.get_contrast_ratio(primary_500, neutral_50)
+            contrast = Validator.contrast_from_luminance(luminance[primary_500], luminance[neutral_50])
             if contrast < 4.5:
                 issues.append(f"Primary-500 on neutral-50 has contrast ratio {contrast:.2f}, needs >= 4.5")
         
         # Validate semantic colors
-        semantic_colors = {
-            "success": None,
-            "error": None,
-            "warning": None,
-            "info": None
-        }
-        
-        for color in tokens.colors:
-            if color.name.startswith("success-"):
-                semantic_colors["success"] = color.value
-            elif color.name.startswith("error-"):
-                semantic_colors["error"] = color.value
-            elif color.name.startswith("warning-"):
-                semantic_colors["warning"] = color.value
-            elif color.name.startswith("info-"):
-                semantic_colors["info"] = color.value
-        
         for name, color_value in semantic_colors.items():
             if color_value:
-                contrast = Validator.get_contrast_ratio(color_value, white)
+                contrast = Validator.contrast_from_luminance(luminance[color_value], _WHITE_LUM)
                 if contrast < 4.5:
                     issues.append(f"{name.capitalize()} color ({color_value}) on white has contrast ratio {contrast:.2f}, needs >= 4.5")
         
@@ -139,9 +188,8 @@ class Validator:
         
         # Check if color warmth matches principles
         # This is a heuristic - warm colors have higher red/yellow components
-        primary_colors = [c for c in tokens.colors if c.name == "primary-500"]
-        if primary_colors:
-            primary_hex = primary_colors[0].value
+        primary_hex = _color_value(tokens.colors_by_name, "primary-500")
+        if primary_hex:
             rgb = Validator.hex_to_rgb(primary_hex)
             r, g, b = rgb
             
@@ -159,7 +207,7 @@ class Validator:
                     issues.append(f"Color system is too warm (warmth score: {color_warmth:.2f}) for principles.warmth={principles.warmth}")
         
         # Check if density matches spacing
-        spacing_values = [int(s.value.replace('px', '')) for s in tokens.spacing]
+        spacing_values = [s.value_px for s in tokens.spacing]
         if spacing_values:
             base_spacing = min(spacing_values) if spacing_values else 4
             
@@ -170,7 +218,7 @@ class Validator:
         
         # Check if clarity matches typography sizes
         if tokens.typography:
-            body_sizes = [float(t.size.replace('px', '')) for t in tokens.typography if t.role == "body"]
+            body_sizes = [t.size_px for t in tokens.typography if t.role == "body"]
             if body_sizes:
                 min_body_size = min(body_sizes)
                 if principles.clarity >= 9 and min_body_size < 14:
@@ -200,18 +248,16 @@ class Validator:
         issues = []
         warnings = []
         
-        from agents.knowledge_base import KnowledgeBase
-        
         # Get expected components for industry
-        expected_components = KnowledgeBase.get_components_for_industry(industry)
-        actual_components = [c.name for c in inventory.components]
+        expected_components = KnowledgeBase.get_profile(industry).components
+        actual_components = frozenset(c.name for c in inventory.components)
         
         # Check for missing critical components
         missing_critical = []
         for expected in expected_components:
             if expected not in actual_components:
                 # Some components are optional
-                if expected in ["Button", "Input", "Select", "Modal", "Alert"]:
+                if expected in _CRITICAL_COMPONENTS:
                     missing_critical.append(expected)
                 else:
                     warnings.append(f"Consider adding {expected} component for {industry} products")
@@ -1,56 +1,111 @@
 """Visual Identity Agent - Generates design tokens and visual foundations with enhanced autonomy."""
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import DesignPrinciples, DesignTokens, ColorToken, TypographyToken, SpacingToken, ColorRationale
 from typing import Optional, Tuple, List, Dict, Any
 import colorsys
-import json
+import functools
 import hashlib
-from litellm import completion
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from agents import config
 from agents.knowledge_base import KnowledgeBase
 from agents.prompts import PromptTemplates
+from agents import llm_cache
+from agents.llm_client import complete_json
 from agents.validator import Validator
 
-load_dotenv()
+# (weight, lightness) steps of a generated color scale (50 is light, 900 is dark); None keeps the base lightness
+_SCALE_LIGHTNESS = (
+    (50, 0.97), (100, 0.9), (200, 0.8), (300, 0.7), (400, 0.6),
+    (500, None), (600, 0.4), (700, 0.3), (800, 0.2), (900, 0.1)
+)
+
+# Dark-mode primary scale: lighter shades (50-300) for text/accents, darker ones (400-950) for backgrounds
+_DARK_PRIMARY_LIGHTNESS = tuple(
+    (i, 0.7 + (i / 1000) * 0.2 if i <= 300 else 0.1 + ((1000 - i) / 1000) * 0.3)
+    for i in range(50, 951, 100)
+)
+
+# Dark-mode neutrals are inverted (50 is dark background, 900 is light text), never pure black/white
+_DARK_NEUTRAL_LIGHTNESS = tuple(
+    (i, max(0.05, min(0.95, 1.0 - (i / 1000))))
+    for i in range(50, 951, 100)
+)
+
+# Semantic (h, s, l) base colors, darkened towards 4.5:1 contrast on white
+_SEMANTIC_BASE = {
+    "success": (0.4, 0.65, 0.38),   # Darker green (was 0.45)
+    "error": (0.0, 0.70, 0.45),     # Darker red (was 0.50)
+    "warning": (0.12, 0.80, 0.40),  # Darker orange (was 0.50)
+    "info": (0.58, 0.70, 0.45)      # Darker blue (was 0.50)
+}
+
+# Powers of each type scale ratio, for the body (-2..3) and heading (2..7) steps
+_TYPE_SCALE_POWERS = {
+    ratio: {i: ratio ** i for i in range(-2, 8)}
+    for ratio in (1.2, 1.25, 1.22)
+}
+
+# Border radius by philosophy; component-first (and anything unknown) uses the default
+_BORDER_RADIUS = {
+    "brand-led": {"small": "4px", "medium": "8px", "large": "16px", "round": "9999px"},
+    "utility-first": {"small": "2px", "medium": "4px", "large": "6px", "round": "9999px"}
+}
+_DEFAULT_BORDER_RADIUS = {"small": "6px", "medium": "12px", "large": "24px", "round": "9999px"}
+
+# Shadows: tighter, lighter ones for dense UIs
+_DENSE_SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1)"
+}
+_DEFAULT_SHADOWS = {
+    "sm": "0 1px 3px 0 rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)"
+}
+
+# Saturation multiplier of the neutral scale; neutral-50 is the lightest surface UI colors sit on
+_NEUTRAL_SATURATION_MULT = 0.05
+
+# Lightness bisection steps in ensure_contrast; 10 halvings resolve finer than one 8-bit channel step
+_CONTRAST_BISECT_STEPS = 10
+
+# Shared pool for the (possibly LLM-bound) light color system, so each token build reuses a thread
+_COLOR_SYSTEM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="color-system")
 
 class VisualIdentityAgent:
     """Agent that generates visual design tokens based on design principles."""
 
     def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY") or os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
-        # Auto-detect model based on API key if MODEL_NAME not explicitly set
-        if os.getenv("MODEL_NAME"):
-            self.model = os.getenv("MODEL_NAME")
-        elif os.getenv("GEMINI_API_KEY"):
-            self.model = "gemini/gemini-1.5-pro-latest"
-        elif os.getenv("OPENAI_API_KEY"):
-            self.model = "gpt-5"  # Best for complex reasoning and structured JSON output
-        elif os.getenv("ANTHROPIC_API_KEY"):
-            self.model = "claude-3-5-sonnet-20241022"
-        else:
-            self.model = "gemini/gemini-1.5-pro-latest"  # fallback default
+        self.api_key = config.API_KEY
+        self.model = config.MODEL_NAME
 
     def generate_color_system(self, principles: DesignPrinciples, product_idea: str = "") -> Tuple[List[ColorToken], Optional[ColorRationale], Optional[List[Dict[str, Any]]]]:
         """Generate a complete color system based on design principles with industry context."""
         industry = principles.industry_context.industry if principles.industry_context else "unknown"
-        industry_colors = KnowledgeBase.get_industry_color_suggestions(industry)
+        industry_colors = KnowledgeBase.get_profile(industry).colors
+        
+        # Deterministic per-product seed for color variation, derived once for every path below
+        seed = int(hashlib.md5(product_idea.encode()).hexdigest()[:8], 16) if product_idea else 0
         
         if self.api_key:
             try:
-                prompt = PromptTemplates.visual_identity_color_prompt(principles, industry, industry_colors, product_idea)
+                system_prefix, user_message = PromptTemplates.visual_identity_color_prompt(principles, industry, industry_colors, product_idea)
                 
-                # Use higher temperature for more creative/diverse color generation
-                response = completion(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"},
-                    temperature=0.9  # Higher temperature for more variation
-                )
+                # Reuse the answer for an identical prompt (the call is deterministic, see below)
+                cache_key = llm_cache.prompt_hash(system_prefix, user_message)
+                data = llm_cache.lookup(self.model, cache_key)
+                from_cache = data is not None
                 
-                data = json.loads(response.choices[0].message.content)
+                if not from_cache:
+                    # Deterministic sampling keeps the response cacheable; per-product diversity
+                    # comes from the seed-based variation applied below
+                    data = complete_json(
+                        model=self.model,
+                        messages=PromptTemplates.cached_messages(self.model, system_prefix, user_message),
+                        response_format={"type": "json_object"},
+                        temperature=0
+                    )
                 
                 # Check for new format with recommendations
                 recommendations_data = data.get('primary_recommendations')
@@ -99,7 +154,6 @@ class VisualIdentityAgent:
                 
                 # Add seed-based variation to AI-generated colors to ensure diversity
                 if product_idea:
-                    seed = int(hashlib.md5(product_idea.encode()).hexdigest()[:8], 16)
                     # Convert hex to HSL
                     r = int(primary_hex[1:3], 16) / 255
                     g = int(primary_hex[3:5], 16) / 255
@@ -120,23 +174,25 @@ class VisualIdentityAgent:
                     print(f"🎨 Applied seed-based variation to AI color (seed: {seed % 1000})")
                 
                 # Check primary color contrast (AI should generate accessible colors from the start)
-                contrast = Validator.get_contrast_ratio(primary_hex, "#FFFFFF")
+                # against neutral-50, the darkest light surface it sits on, which also covers white
+                surface_hex = self.light_surface_hex(neutral_hex)
+                contrast = Validator.get_contrast_ratio(primary_hex, surface_hex)
                 if contrast < 4.5:
                     # Only adjust if absolutely necessary (AI should have generated accessible color)
                     print(f"⚠️  WARNING: Primary color contrast {contrast:.2f} < 4.5. AI should generate accessible colors from the start.")
-                    primary_hex = self.ensure_contrast(primary_hex, "#FFFFFF", min_contrast=4.5)
-                    print(f"✅ Adjusted to {primary_hex} with contrast {Validator.get_contrast_ratio(primary_hex, '#FFFFFF'):.2f}")
+                    primary_hex, contrast = self.ensure_contrast(primary_hex, surface_hex, min_contrast=4.5)
+                    print(f"✅ Adjusted to {primary_hex} with contrast {contrast:.2f}")
                 
                 # Generate full color scales
                 colors = self.generate_scale_from_hex(primary_hex, "primary")
-                colors.extend(self.generate_scale_from_hex(neutral_hex, "neutral", saturation_mult=0.05))
+                colors.extend(self.generate_scale_from_hex(neutral_hex, "neutral", saturation_mult=_NEUTRAL_SATURATION_MULT))
                 
                 # Add secondary color scale if provided
                 if secondary_hex and secondary_hex.startswith('#'):
                     # Ensure secondary color is accessible
-                    contrast = Validator.get_contrast_ratio(secondary_hex, "#FFFFFF")
+                    contrast = Validator.get_contrast_ratio(secondary_hex, surface_hex)
                     if contrast < 4.5:
-                        secondary_hex = self.ensure_contrast(secondary_hex, "#FFFFFF", min_contrast=4.5)
+                        secondary_hex, _ = self.ensure_contrast(secondary_hex, surface_hex, min_contrast=4.5)
                     colors.extend(self.generate_scale_from_hex(secondary_hex, "secondary"))
                 
                 # Add accent if provided
@@ -156,6 +212,9 @@ class VisualIdentityAgent:
                     overall=overall_rationale or f"Color system designed for {industry} with {principles.warmth}/10 warmth and {principles.philosophy} philosophy."
                 )
                 
+                # Only cache responses that produced a usable palette
+                if not from_cache:
+                    llm_cache.store(self.model, cache_key, data)
                 return colors, rationale, primary_recommendations
             except Exception as e:
                 print(f"AI Color generation failed, falling back to rules: {e}")
@@ -166,11 +225,6 @@ class VisualIdentityAgent:
             neutral_hex = industry_colors.get('neutral')
             accent_hex = industry_colors.get('accent')
         else:
-            # Generate seed from product_idea for deterministic variation
-            seed = 0
-            if product_idea:
-                seed = int(hashlib.md5(product_idea.encode()).hexdigest()[:8], 16)
-            
             # Base hue based on warmth, then add seed-based variation
             if principles.warmth <= 3:
                 base_hue = 0.6  # Cool (blue)
@@ -202,9 +256,9 @@ class VisualIdentityAgent:
             neutral_hex = "#64748b"
             accent_hex = None
         
-        # Generate 3 recommendations for fallback
+        # Generate 3 recommendations for fallback, accessible on the neutral-50 surface (and so on white)
+        surface_hex = self.light_surface_hex(neutral_hex)
         primary_recommendations = []
-        seed = int(hashlib.md5(product_idea.encode()).hexdigest()[:8], 16) if product_idea else 0
         
         # Generate 3 different primary colors with variations
         for i in range(3):
@@ -245,10 +299,10 @@ class VisualIdentityAgent:
             rec_secondary = self.hsl_to_hex(comp_hue, comp_saturation, comp_lightness)
             
             # Ensure accessibility
-            if Validator.get_contrast_ratio(rec_primary, "#FFFFFF") < 4.5:
-                rec_primary = self.ensure_contrast(rec_primary, "#FFFFFF", min_contrast=4.5)
-            if Validator.get_contrast_ratio(rec_secondary, "#FFFFFF") < 4.5:
-                rec_secondary = self.ensure_contrast(rec_secondary, "#FFFFFF", min_contrast=4.5)
+            if Validator.get_contrast_ratio(rec_primary, surface_hex) < 4.5:
+                rec_primary, _ = self.ensure_contrast(rec_primary, surface_hex, min_contrast=4.5)
+            if Validator.get_contrast_ratio(rec_secondary, surface_hex) < 4.5:
+                rec_secondary, _ = self.ensure_contrast(rec_secondary, surface_hex, min_contrast=4.5)
             
             primary_recommendations.append({
                 'primary': rec_primary,
@@ -262,20 +316,20 @@ class VisualIdentityAgent:
         secondary_hex = selected_rec['secondary']
         
         # Check primary color contrast
-        contrast = Validator.get_contrast_ratio(primary_hex, "#FFFFFF")
+        contrast = Validator.get_contrast_ratio(primary_hex, surface_hex)
         if contrast < 4.5:
             print(f"⚠️  WARNING: Primary color contrast {contrast:.2f} < 4.5. Adjusting...")
-            primary_hex = self.ensure_contrast(primary_hex, "#FFFFFF", min_contrast=4.5)
-            print(f"✅ Adjusted to {primary_hex} with contrast {Validator.get_contrast_ratio(primary_hex, '#FFFFFF'):.2f}")
+            primary_hex, contrast = self.ensure_contrast(primary_hex, surface_hex, min_contrast=4.5)
+            print(f"✅ Adjusted to {primary_hex} with contrast {contrast:.2f}")
         
         colors = self.generate_scale_from_hex(primary_hex, "primary")
-        colors.extend(self.generate_scale_from_hex(neutral_hex, "neutral", saturation_mult=0.05))
+        colors.extend(self.generate_scale_from_hex(neutral_hex, "neutral", saturation_mult=_NEUTRAL_SATURATION_MULT))
         
         # Add secondary color scale
         if secondary_hex:
-            contrast = Validator.get_contrast_ratio(secondary_hex, "#FFFFFF")
+            contrast = Validator.get_contrast_ratio(secondary_hex, surface_hex)
             if contrast < 4.5:
-                secondary_hex = self.ensure_contrast(secondary_hex, "#FFFFFF", min_contrast=4.5)
+                secondary_hex, _ = self.ensure_contrast(secondary_hex, surface_hex, min_contrast=4.5)
             colors.extend(self.generate_scale_from_hex(secondary_hex, "secondary"))
         
         if accent_hex:
@@ -303,131 +357,58 @@ class VisualIdentityAgent:
         b = int(hex_color[5:7], 16) / 255
         h, l, s = colorsys.rgb_to_hls(r, g, b)
         
-        tokens = []
-        # Inverted weights for lightness (50 is light, 900 is dark)
-        lightness_map = {
-            50: 0.97, 100: 0.9, 200: 0.8, 300: 0.7, 400: 0.6,
-            500: l, 600: 0.4, 700: 0.3, 800: 0.2, 900: 0.1
+        # One lightness per step; 500 keeps the source color's own lightness
+        saturation = s * saturation_mult
+        scale = {
+            weight: self.hsl_to_hex(h, saturation, l if lightness is None else lightness)
+            for weight, lightness in _SCALE_LIGHTNESS
         }
         
-        white = "#FFFFFF"
+        # For neutral-700, verify it meets WCAG AA contrast on white (for body text)
+        # AI should generate dark enough neutral-700 from the start
+        if name == "neutral":
+            white = "#FFFFFF"
+            contrast = Validator.contrast_on_white(scale[700])
+            if contrast < 4.5:
+                # Only adjust if absolutely necessary
+                scale[700], _ = self.ensure_contrast(scale[700], white, min_contrast=4.5)
         
-        for weight, lightness in lightness_map.items():
-            hex_val = self.hsl_to_hex(h, s * saturation_mult, lightness)
-            
-            # For neutral-700, verify it meets WCAG AA contrast on white (for body text)
-            # AI should generate dark enough neutral-700 from the start
-            if name == "neutral" and weight == 700:
-                contrast = Validator.get_contrast_ratio(hex_val, white)
-                if contrast < 4.5:
-                    # Only adjust if absolutely necessary
-                    hex_val = self.ensure_contrast(hex_val, white, min_contrast=4.5)
-            
-            tokens.append(ColorToken(name=f"{name}-{weight}", value=hex_val, role=name))
-        return tokens
+        return [ColorToken(name=f"{name}-{weight}", value=hex_val, role=name) for weight, hex_val in scale.items()]
 
     def generate_typography_system(self, principles: DesignPrinciples) -> list[TypographyToken]:
         """Generate typography tokens based on design principles."""
-
-        # Choose font families based on philosophy
-        if principles.philosophy == "brand-led":
-            heading_family = "Inter, system-ui, sans-serif"
-            body_family = "Inter, system-ui, sans-serif"
-        elif principles.philosophy == "utility-first":
-            heading_family = "system-ui, sans-serif"
-            body_family = "system-ui, sans-serif"
-        else:  # component-first
-            heading_family = "Inter, system-ui, sans-serif"
-            body_family = "Inter, system-ui, sans-serif"
-
-        # Adjust sizes based on density and clarity
-        if principles.density == "dense":
-            base_size = 14
-            scale_factor = 1.2
-        elif principles.density == "spacious":
-            base_size = 16
-            scale_factor = 1.25
-        else:  # balanced
-            base_size = 15
-            scale_factor = 1.22
-        
-        # Ensure minimum size for high clarity requirements
-        if principles.clarity >= 9:
-            base_size = max(base_size, 15)
-
-        typography = []
-
-        # Body text sizes
-        for i in range(-2, 4):
-            size = base_size * (scale_factor ** i)
-            typography.append(TypographyToken(
-                name=f"body-{i+2}",
-                family=body_family,
-                size=f"{size:.1f}px",
-                weight=400,
-                line_height=1.5,
-                role="body"
-            ))
-
-        # Heading sizes (larger scale)
-        for i in range(1, 7):
-            size = base_size * (scale_factor ** (i + 1))
-            typography.append(TypographyToken(
-                name=f"heading-{i}",
-                family=heading_family,
-                size=f"{size:.1f}px",
-                weight=600 if i <= 3 else 500,
-                line_height=1.2,
-                role="heading"
-            ))
-
-        # UI text
-        typography.append(TypographyToken(
-            name="ui-small",
-            family=body_family,
-            size="12px",
-            weight=400,
-            line_height=1.4,
-            role="ui"
-        ))
-
-        return typography
+        # Only a handful of principle combinations exist, so the tokens are built once per combination
+        return _fresh_copies(_typography_tokens(principles.philosophy, principles.density, principles.clarity >= 9))
 
     def generate_spacing_system(self, principles: DesignPrinciples) -> list[SpacingToken]:
         """Generate spacing scale based on design principles."""
+        return _fresh_copies(_spacing_tokens(principles.density))
 
-        # Base spacing unit
-        if principles.density == "dense":
-            base_unit = 4
-        elif principles.density == "spacious":
-            base_unit = 8
-        else:  # balanced
-            base_unit = 6
-
-        spacing = []
-
-        # Generate spacing scale (1-16)
-        for i in range(1, 17):
-            value = base_unit * i
-            spacing.append(SpacingToken(
-                name=f"space-{i}",
-                value=f"{value}px",
-                scale=i
-            ))
-
-        return spacing
-
-    def hsl_to_hex(self, h: float, s: float, l: float) -> str:
+    @staticmethod
+    def hsl_to_hex(h: float, s: float, l: float) -> str:
         """Convert HSL to hex color."""
         r, g, b = colorsys.hls_to_rgb(h, l, s)
-        return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
-
-    def ensure_contrast(self, color_hex: str, background_hex: str = "#FFFFFF", min_contrast: float = 4.5) -> str:
-        """Adjust a color to meet minimum contrast ratio with background."""
-        contrast = Validator.get_contrast_ratio(color_hex, background_hex)
+        # bytes.hex() formats all three channels in C, without per-channel format specs
+        return "#" + bytes((int(r*255), int(g*255), int(b*255))).hex()
+
+    @staticmethod
+    def light_surface_hex(neutral_hex: str) -> str:
+        """Neutral-50 of the scale generated from neutral_hex: the darkest light background colors sit on."""
+        r = int(neutral_hex[1:3], 16) / 255
+        g = int(neutral_hex[3:5], 16) / 255
+        b = int(neutral_hex[5:7], 16) / 255
+        h, _, s = colorsys.rgb_to_hls(r, g, b)
+        return VisualIdentityAgent.hsl_to_hex(h, s * _NEUTRAL_SATURATION_MULT, _SCALE_LIGHTNESS[0][1])
+
+    @staticmethod
+    def ensure_contrast(color_hex: str, background_hex: str = "#FFFFFF", min_contrast: float = 4.5) -> tuple[str, float]:
+        """Adjust a color to meet minimum contrast ratio with background; returns (hex, final contrast)."""
+        # The background's luminance is shared by the check, the bisection and the final contrast
+        background_lum = Validator.get_hex_luminance(background_hex)
+        contrast = Validator.contrast_from_luminance(Validator.get_hex_luminance(color_hex), background_lum)
         
         if contrast >= min_contrast:
-            return color_hex
+            return color_hex, contrast
         
         # Convert to HSL
         r = int(color_hex[1:3], 16) / 255
@@ -435,95 +416,55 @@ class VisualIdentityAgent:
         b = int(color_hex[5:7], 16) / 255
         h, l, s = colorsys.rgb_to_hls(r, g, b)
         
-        # Darken the color until it meets contrast requirements
-        # We'll reduce lightness while maintaining hue and saturation
-        attempts = 0
-        max_attempts = 50
-        adjusted_hex = color_hex
+        # Contrast against a lighter background only grows as lightness drops, so bisect for the
+        # lightest shade (closest to the original) that still meets the requirement
+        failing, passing = l, 0.0
+        for _ in range(_CONTRAST_BISECT_STEPS):
+            mid = (failing + passing) / 2
+            # One-off shades, so skip the luminance cache
+            mid_lum = Validator.rgb_luminance(colorsys.hls_to_rgb(h, mid, s))
+            if Validator.contrast_from_luminance(mid_lum, background_lum) >= min_contrast:
+                passing = mid
+            else:
+                failing = mid
         
-        while contrast < min_contrast and attempts < max_attempts:
-            l = max(0.15, l - 0.08)  # Darken by 8% each iteration, minimum lightness 0.15
-            adjusted_hex = self.hsl_to_hex(h, s, l)
-            contrast = Validator.get_contrast_ratio(adjusted_hex, background_hex)
-            attempts += 1
+        adjusted_hex = VisualIdentityAgent.hsl_to_hex(h, s, passing)
+        contrast = Validator.contrast_from_luminance(Validator.get_hex_luminance(adjusted_hex), background_lum)
         
         # If still not meeting contrast, try reducing saturation and darkening more
         if contrast < min_contrast:
             # More aggressive darkening
             l = 0.25  # Force darker
             s = max(0.3, s * 0.8)  # Slightly reduce saturation
-            adjusted_hex = self.hsl_to_hex(h, s, l)
-            contrast = Validator.get_contrast_ratio(adjusted_hex, background_hex)
+            adjusted_hex = VisualIdentityAgent.hsl_to_hex(h, s, l)
+            contrast = Validator.contrast_from_luminance(Validator.get_hex_luminance(adjusted_hex), background_lum)
         
-        return adjusted_hex
+        return adjusted_hex, contrast
 
     def generate_accessible_semantic_colors(self) -> list[ColorToken]:
         """Generate semantic colors that meet WCAG AA contrast requirements on white."""
-        # Use darker base colors that naturally meet 4.5:1 contrast on white
-        # These lightness values are chosen to ensure accessibility from the start
-        semantic_base = {
-            "success": {"h": 0.4, "s": 0.65, "l": 0.38},  # Darker green (was 0.45)
-            "error": {"h": 0.0, "s": 0.70, "l": 0.45},   # Darker red (was 0.50)
-            "warning": {"h": 0.12, "s": 0.80, "l": 0.40}, # Darker orange (was 0.50)
-            "info": {"h": 0.58, "s": 0.70, "l": 0.45}     # Darker blue (was 0.50)
-        }
-        
-        semantic_colors = []
-        white = "#FFFFFF"
-        
-        for name, hsl in semantic_base.items():
-            # Generate color with darker base (should meet contrast naturally)
-            base_hex = self.hsl_to_hex(hsl["h"], hsl["s"], hsl["l"])
-            
-            # Verify contrast (should meet 4.5:1 naturally with darker base colors)
-            contrast = Validator.get_contrast_ratio(base_hex, white)
-            if contrast < 4.5:
-                # Only adjust if absolutely necessary (should rarely happen with darker base)
-                accessible_hex = self.ensure_contrast(base_hex, white, min_contrast=4.5)
-            else:
-                accessible_hex = base_hex
-            
-            semantic_colors.append(
-                ColorToken(name=f"{name}-500", value=accessible_hex, role="semantic")
-            )
-        
-        return semantic_colors
+        # The tokens are fixed and made accessible once, at import
+        return _fresh_copies(_SEMANTIC_TOKENS)
 
     def generate_design_tokens(self, principles: DesignPrinciples, product_idea: str = "") -> DesignTokens:
         """Generate complete design token system."""
-        # Generate light mode colors with rationale and recommendations
-        light_colors, color_rationale, primary_recommendations = self.generate_color_system(principles, product_idea)
-        
-        # Generate dark mode colors
+        # Generate light mode colors with rationale and recommendations; this may wait on the LLM,
+        # so the dark mode colors, typography and spacing are built locally in the meantime
+        color_future = _COLOR_SYSTEM_EXECUTOR.submit(self.generate_color_system, principles, product_idea)
         dark_colors = self.generate_dark_color_system(principles)
+        typography = self.generate_typography_system(principles)
+        spacing = self.generate_spacing_system(principles)
+        light_colors, color_rationale, primary_recommendations = color_future.result()
 
-        # Border radius based on philosophy
-        if principles.philosophy == "brand-led":
-            border_radius = {"small": "4px", "medium": "8px", "large": "16px", "round": "9999px"}
-        elif principles.philosophy == "utility-first":
-            border_radius = {"small": "2px", "medium": "4px", "large": "6px", "round": "9999px"}
-        else:
-            border_radius = {"small": "6px", "medium": "12px", "large": "24px", "round": "9999px"}
-
-        # Shadows based on density
-        if principles.density == "dense":
-            shadows = {
-                "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
-                "md": "0 4px 6px -1px rgb(0 0 0 / 0.1)",
-                "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1)"
-            }
-        else:
-            shadows = {
-                "sm": "0 1px 3px 0 rgb(0 0 0 / 0.1)",
-                "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
-                "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)"
-            }
+        # Border radius based on philosophy, shadows based on density
+        border_radius = dict(_BORDER_RADIUS.get(principles.philosophy, _DEFAULT_BORDER_RADIUS))
+        shadows = dict(_DENSE_SHADOWS if principles.density == "dense" else _DEFAULT_SHADOWS)
 
         return DesignTokens(
             colors=light_colors,
             dark_colors=dark_colors,
-            typography=self.generate_typography_system(principles),
-            spacing=self.generate_spacing_system(principles),
+            typography=typography,
+            spacing=spacing,
             border_radius=border_radius,
             shadows=shadows,
             color_rationale=color_rationale,
@@ -543,44 +484,139 @@ class VisualIdentityAgent:
         else:
             base_hue = 0.5  # Neutral
 
-        saturation = 0.5  # Slightly desaturated for dark mode
-
-        colors = []
-        # Primary scale - adjusted for dark mode
-        for i in range(50, 951, 100):
-            # In dark mode, lighter shades (50-300) are used for text/accents
-            # Darker shades (700-900) are used for backgrounds
-            lightness = (1000 - i) / 1000
-            # Adjust lightness for better dark mode contrast
-            if i <= 300:
-                lightness = 0.7 + (i / 1000) * 0.2  # Lighter for text
-            else:
-                lightness = 0.1 + ((1000 - i) / 1000) * 0.3  # Darker for backgrounds
-            
-            hex_color = self.hsl_to_hex(base_hue, saturation, lightness)
-            colors.append(ColorToken(
-                name=f"primary-{i}",
-                value=hex_color,
-                role="primary"
-            ))
-
-        # Neutral grays - inverted for dark mode backgrounds
+        # Only the two hues vary, so each dark palette is built once
         neutral_hue = 0.08 if principles.warmth >= 6 else 0.58
-        for i in range(50, 951, 100):
-            # Dark mode: 50 is dark background, 900 is light text
-            lightness = 1.0 - (i / 1000)
-            # Ensure we don't go to pure black/white
-            lightness = max(0.05, min(0.95, lightness))
-            hex_color = self.hsl_to_hex(neutral_hue, 0.05, lightness)
-            colors.append(ColorToken(
-                name=f"neutral-{i}",
-                value=hex_color,
-                role="neutral"
-            ))
-
-        # Semantic colors (slightly adjusted for dark mode contrast)
-        # For dark mode, we still want good contrast but on dark backgrounds
-        dark_semantic = self.generate_accessible_semantic_colors()
-        colors.extend(dark_semantic)
-
-        return colors
+        return _fresh_copies(_dark_palette(base_hue, neutral_hue))
+
+
+def _fresh_copies(tokens: Tuple[Any, ...]) -> list:
+    """Deep copies of shared template tokens, so callers can edit their design tokens without touching later results."""
+    return [token.model_copy(deep=True) for token in tokens]
+
+
+# Semantic colors don't depend on the principles, so they are generated and adjusted for contrast once
+# (success and warning fall just short of 4.5:1 on white and are darkened here)
+_SEMANTIC_TOKENS = tuple(
+    ColorToken(
+        name=f"{name}-500",
+        value=VisualIdentityAgent.ensure_contrast(VisualIdentityAgent.hsl_to_hex(h, s, l), "#FFFFFF", min_contrast=4.5)[0],
+        role="semantic"
+    )
+    for name, (h, s, l) in _SEMANTIC_BASE.items()
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _typography_tokens(philosophy: str, density: str, high_clarity: bool) -> Tuple[TypographyToken, ...]:
+    """Typography tokens for one combination of philosophy, density and clarity >= 9."""
+    # Choose font families based on philosophy
+    if philosophy == "brand-led":
+        heading_family = "Inter, system-ui, sans-serif"
+        body_family = "Inter, system-ui, sans-serif"
+    elif philosophy == "utility-first":
+        heading_family = "system-ui, sans-serif"
+        body_family = "system-ui, sans-serif"
+    else:  # component-first
+        heading_family = "Inter, system-ui, sans-serif"
+        body_family = "Inter, system-ui, sans-serif"
+
+    # Adjust sizes based on density and clarity
+    if density == "dense":
+        base_size = 14
+        scale_factor = 1.2
+    elif density == "spacious":
+        base_size = 16
+        scale_factor = 1.25
+    else:  # balanced
+        base_size = 15
+        scale_factor = 1.22
+    
+    # Ensure minimum size for high clarity requirements
+    if high_clarity:
+        base_size = max(base_size, 15)
+
+    typography = []
+    powers = _TYPE_SCALE_POWERS[scale_factor]
+
+    # Body text sizes
+    for i in range(-2, 4):
+        size = base_size * powers[i]
+        typography.append(TypographyToken(
+            name=f"body-{i+2}",
+            family=body_family,
+            size=f"{size:.1f}px",
+            weight=400,
+            line_height=1.5,
+            role="body"
+        ))
+
+    # Heading sizes (larger scale)
+    for i in range(1, 7):
+        size = base_size * powers[i + 1]
+        typography.append(TypographyToken(
+            name=f"heading-{i}",
+            family=heading_family,
+            size=f"{size:.1f}px",
+            weight=600 if i <= 3 else 500,
+            line_height=1.2,
+            role="heading"
+        ))
+
+    # UI text
+    typography.append(TypographyToken(
+        name="ui-small",
+        family=body_family,
+        size="12px",
+        weight=400,
+        line_height=1.4,
+        role="ui"
+    ))
+
+    return tuple(typography)
+
+
+@functools.lru_cache(maxsize=8)
+def _spacing_tokens(density: str) -> Tuple[SpacingToken, ...]:
+    """Spacing tokens for one density."""
+    # Base spacing unit
+    if density == "dense":
+        base_unit = 4
+    elif density == "spacious":
+        base_unit = 8
+    else:  # balanced
+        base_unit = 6
+
+    spacing = []
+
+    # Generate spacing scale (1-16)
+    for i in range(1, 17):
+        value = base_unit * i
+        spacing.append(SpacingToken(
+            name=f"space-{i}",
+            value=f"{value}px",
+            scale=i
+        ))
+
+    return tuple(spacing)
+
+
+@functools.lru_cache(maxsize=8)
+def _dark_palette(base_hue: float, neutral_hue: float) -> Tuple[ColorToken, ...]:
+    """Dark mode primary, neutral and semantic tokens for one pair of hues."""
+    saturation = 0.5  # Slightly desaturated for dark mode
+
+    # Both scales read their lightness from the precomputed dark-mode tables
+    colors = [
+        ColorToken(name=f"primary-{weight}", value=VisualIdentityAgent.hsl_to_hex(base_hue, saturation, lightness), role="primary")
+        for weight, lightness in _DARK_PRIMARY_LIGHTNESS
+    ]
+    colors.extend(
+        ColorToken(name=f"neutral-{weight}", value=VisualIdentityAgent.hsl_to_hex(neutral_hue, 0.05, lightness), role="neutral")
+        for weight, lightness in _DARK_NEUTRAL_LIGHTNESS
+    )
+
+    # Semantic colors (slightly adjusted for dark mode contrast)
+    # For dark mode, we still want good contrast but on dark backgrounds
+    colors.extend(_SEMANTIC_TOKENS)
+
+    return tuple(colors)
@@ -3,46 +3,42 @@
 
 import sys
 import os
-import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from main import DesignSystemGenerator
-from models import DesignSystemInput, TargetUser, BrandTrait, Platform
+# The generator stack (models, agents, templates) is imported inside each command,
+# so --help and argument errors don't pay for loading it
+
+# Characters in generated_at that aren't safe in output file names
+_TIMESTAMP_FILENAME_TRANS = str.maketrans(": ", "--")
+
+
+def _parse_enum_list(raw: str, enum_cls, label: str) -> list:
+    """Parse a comma-separated option into enum members, exiting with every invalid value listed."""
+    items = [v.strip() for v in raw.split(',')]
+    members = {m.value: m for m in enum_cls}
+    invalid = [v for v in items if v not in members]
+    if invalid:
+        print(f"❌ Error: Invalid {label}: {', '.join(invalid)}. Valid options: {', '.join(members)}")
+        sys.exit(1)
+    return [members[v] for v in items]
 
 
 def generate_command(args):
     """Generate a design system from product idea."""
+    from models import DesignSystemInput, TargetUser, BrandTrait, Platform
+    
     print("🎨 Technology Rivers Design System Generator\n")
     
     # Parse optional parameters
-    target_users = None
-    if args.users:
-        try:
-            target_users = [TargetUser(u.strip()) for u in args.users.split(',')]
-        except ValueError as e:
-            print(f"❌ Error: Invalid target user. Valid options: B2B, B2C, enterprise, consumer")
-            sys.exit(1)
-    
-    brand_traits = None
-    if args.traits:
-        try:
-            brand_traits = [BrandTrait(t.strip()) for t in args.traits.split(',')]
-        except ValueError as e:
-            print(f"❌ Error: Invalid brand trait. Valid options: modern, clinical, playful, premium, bold, minimal, warm, professional")
-            sys.exit(1)
-    
-    platforms = None
-    if args.platforms:
-        try:
-            platforms = [Platform(p.strip()) for p in args.platforms.split(',')]
-        except ValueError as e:
-            print(f"❌ Error: Invalid platform. Valid options: web, mobile, dashboard, marketing")
-            sys.exit(1)
+    target_users = _parse_enum_list(args.users, TargetUser, "target user") if args.users else None
+    brand_traits = _parse_enum_list(args.traits, BrandTrait, "brand trait") if args.traits else None
+    platforms = _parse_enum_list(args.platforms, Platform, "platform") if args.platforms else None
     
     # Create input
     input_data = DesignSystemInput(
@@ -53,6 +49,7 @@ def generate_command(args):
     )
     
     # Generate
+    from main import DesignSystemGenerator
     generator = DesignSystemGenerator()
     result = generator.generate_design_system(input_data)
     
@@ -60,35 +57,53 @@ def generate_command(args):
     output_dir = Path(args.output or "generated")
     output_dir.mkdir(exist_ok=True)
     
-    timestamp = result.generated_at.replace(':', '-').replace(' ', '-')
+    timestamp = result.generated_at.translate(_TIMESTAMP_FILENAME_TRANS)
     output_file = output_dir / f"design-system-{timestamp}.json"
     
-    with open(output_file, 'w') as f:
-        json.dump(result.model_dump(), f, indent=2)
+    # Serialize straight from the model; no intermediate dict
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(result.model_dump_json(indent=2))
     
-    print(f"\n✅ Design system generated successfully!")
-    print(f"📁 Output: {output_file}")
-    print(f"🎨 Colors: {len(result.tokens.colors)}")
-    print(f"🧩 Components: {len(result.components.components)}")
+    # Summary goes out in a single write
+    print("\n".join([
+        "\n✅ Design system generated successfully!",
+        f"📁 Output: {output_file}",
+        f"🎨 Colors: {len(result.tokens.colors)}",
+        f"🧩 Components: {len(result.components.components)}",
+    ]))
     
     return result
 
 
+def _write_rendered(render, item, file_path: Path):
+    """Render one template item and write it to file_path (run on the file-writer pool)."""
+    file_path.write_bytes(render(item).encode("utf-8"))
+
+
+def _file_writer_pool() -> ThreadPoolExecutor:
+    """Thread pool for overlapping template rendering with per-file writes."""
+    return ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+
+
 def init_command(args):
     """Initialize a project with generated design system."""
     print("🚀 Initializing project with design system...\n")
     
     # Check if output directory exists
     output_dir = Path(args.directory or ".")
-    if output_dir.exists() and any(output_dir.iterdir()):
-        if not args.force:
-            print(f"❌ Error: Directory '{output_dir}' is not empty. Use --force to overwrite.")
-            sys.exit(1)
+    if output_dir.exists() and not args.force:
+        # Stop at the first entry rather than listing the whole directory
+        with os.scandir(output_dir) as entries:
+            if next(entries, None) is not None:
+                print(f"❌ Error: Directory '{output_dir}' is not empty. Use --force to overwrite.")
+                sys.exit(1)
     
     # Generate design system first
     print("📋 Generating design system...")
     product_idea = args.product_idea or input("Enter your product idea: ")
     
+    from main import DesignSystemGenerator
+    from models import DesignSystemInput
     input_data = DesignSystemInput(product_idea=product_idea)
     generator = DesignSystemGenerator()
     result = generator.generate_design_system(input_data)
@@ -97,57 +112,67 @@ def init_command(args):
     output_dir.mkdir(exist_ok=True)
     
     # Save design system JSON
-    with open(output_dir / "design-system.json", 'w') as f:
-        json.dump(result.model_dump(), f, indent=2)
+    (output_dir / "design-system.json").write_bytes(result.model_dump_json(indent=2).encode("utf-8"))
     
     # Generate component library files
     from templates.components.generator import ComponentGenerator
     comp_gen = ComponentGenerator(result.tokens)
     
     # Create directories
-    (output_dir / "src" / "components").mkdir(parents=True, exist_ok=True)
-    (output_dir / "src" / "styles").mkdir(parents=True, exist_ok=True)
+    src_dir = output_dir / "src"
+    components_dir = src_dir / "components"
+    styles_dir = src_dir / "styles"
+    components_dir.mkdir(parents=True, exist_ok=True)
+    styles_dir.mkdir(exist_ok=True)
     (output_dir / ".storybook").mkdir(exist_ok=True)
     
     # Generate CSS variables
     css_vars = comp_gen.generate_css_variables()
-    with open(output_dir / "src" / "styles" / "tokens.css", 'w') as f:
-        f.write(css_vars)
-    
-    # Generate components
-    for component_spec in result.components.components:
-        component_name = component_spec.name.lower()
-        method_name = f"generate_{component_name}_component"
-        if hasattr(comp_gen, method_name):
-            method = getattr(comp_gen, method_name)
-            try:
-                code = method(component_spec)
-                file_path = output_dir / "src" / "components" / f"{component_spec.name}.tsx"
-                with open(file_path, 'w') as f:
-                    f.write(code)
-            except Exception as e:
-                print(f"   ⚠️  Warning: Could not generate {component_spec.name}: {e}")
+    (styles_dir / "tokens.css").write_bytes(css_vars.encode("utf-8"))
+    
+    # Component renderers keyed by lowercased component name, from generate_<name>_component
+    renderers = {
+        attr[len("generate_"):-len("_component")]: getattr(comp_gen, attr)
+        for attr in dir(comp_gen)
+        if attr.startswith("generate_") and attr.endswith("_component")
+    }
+    
+    # Generate components, one file per component, rendered and written concurrently
+    with _file_writer_pool() as executor:
+        futures = []
+        for component_spec in result.components.components:
+            method = renderers.get(component_spec.name.lower())
+            if method is not None:
+                file_path = components_dir / f"{component_spec.name}.tsx"
+                futures.append((component_spec, executor.submit(_write_rendered, method, component_spec, file_path)))
+    
+    # Report failures in inventory order
+    for component_spec, future in futures:
+        e = future.exception()
+        if e is not None:
+            print(f"   ⚠️  Warning: Could not generate {component_spec.name}: {e}")
     
     # Generate package.json
     package_json = comp_gen.generate_package_json()
-    with open(output_dir / "package.json", 'w') as f:
-        f.write(package_json)
+    (output_dir / "package.json").write_bytes(package_json.encode("utf-8"))
     
     # Generate README
+    from models import ComponentCode
     readme = comp_gen.generate_readme(
-        [ComponentCode(name=c.name, code="", file_path=f"src/components/{c.name}.tsx") 
+        [ComponentCode(name=c.name, code="", file_path=f"src/components/{c.name}.tsx")
          for c in result.components.components],
         result.principles.model_dump(),
         product_idea
     )
-    with open(output_dir / "README.md", 'w') as f:
-        f.write(readme)
-    
-    print(f"\n✅ Project initialized in '{output_dir}'")
-    print(f"📦 Next steps:")
-    print(f"   cd {output_dir}")
-    print(f"   npm install")
-    print(f"   npm run storybook")
+    (output_dir / "README.md").write_bytes(readme.encode("utf-8"))
+    
+    print("\n".join([
+        f"\n✅ Project initialized in '{output_dir}'",
+        "📦 Next steps:",
+        f"   cd {output_dir}",
+        "   npm install",
+        "   npm run storybook",
+    ]))
 
 
 def export_command(args):
@@ -160,11 +185,8 @@ def export_command(args):
         print(f"❌ Error: File '{input_file}' not found.")
         sys.exit(1)
     
-    with open(input_file, 'r') as f:
-        data = json.load(f)
-    
     from models import DesignSystemOutput
-    result = DesignSystemOutput(**data)
+    result = DesignSystemOutput.model_validate_json(input_file.read_bytes())
     
     output_dir = Path(args.output or "export")
     output_dir.mkdir(exist_ok=True)
@@ -188,8 +210,7 @@ def export_command(args):
         from templates.components.generator import ComponentGenerator
         comp_gen = ComponentGenerator(result.tokens)
         css_vars = comp_gen.generate_css_variables()
-        with open(output_dir / "tokens.css", 'w') as f:
-            f.write(css_vars)
+        (output_dir / "tokens.css").write_bytes(css_vars.encode("utf-8"))
         print(f"✅ CSS variables exported to '{output_dir}/tokens.css'")
     
     elif args.format == "typescript":
@@ -198,10 +219,10 @@ def export_command(args):
         ts_gen = TypeScriptGenerator()
         types = ts_gen.generate_all(result)
         
-        (output_dir / "types").mkdir(exist_ok=True)
+        types_dir = output_dir / "types"
+        types_dir.mkdir(exist_ok=True)
         for filename, content in types.items():
-            with open(output_dir / "types" / filename, 'w') as f:
-                f.write(content)
+            (types_dir / filename).write_bytes(content.encode("utf-8"))
         print(f"✅ TypeScript types exported to '{output_dir}/types/'")
     
     elif args.format == "guidelines":
@@ -210,11 +231,15 @@ def export_command(args):
         guide_gen = GuidelinesGenerator()
         guidelines = guide_gen.generate_all_guidelines(result.components.components)
         
-        (output_dir / "guidelines").mkdir(exist_ok=True)
-        for comp in result.components.components:
-            markdown = guide_gen.generate_markdown(comp)
-            with open(output_dir / "guidelines" / f"{comp.name}.md", 'w') as f:
-                f.write(markdown)
+        guidelines_dir = output_dir / "guidelines"
+        guidelines_dir.mkdir(exist_ok=True)
+        with _file_writer_pool() as executor:
+            futures = [
+                executor.submit(_write_rendered, guide_gen.generate_markdown, comp, guidelines_dir / f"{comp.name}.md")
+                for comp in result.components.components
+            ]
+        for future in futures:
+            future.result()
         print(f"✅ Component guidelines exported to '{output_dir}/guidelines/'")
     
     else:
@@ -224,22 +249,16 @@ def export_command(args):
 
 def preview_command(args):
     """Start local preview server."""
-    import subprocess
+    import uvicorn
     
     print("🚀 Starting preview server...\n")
     print("📝 Starting web interface on http://localhost:8000")
     print("   Press Ctrl+C to stop\n")
     
-    try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn",
-            "web.app:app",
-            "--host", "0.0.0.0",
-            "--port", str(args.port),
-            "--reload"
-        ])
-    except KeyboardInterrupt:
-        print("\n\n👋 Preview server stopped.")
+    # Serve from this process instead of spawning a second interpreter to run uvicorn;
+    # uvicorn handles Ctrl+C itself and returns once the server has shut down
+    uvicorn.run("web.app:app", host="0.0.0.0", port=args.port, reload=True)
+    print("\n👋 Preview server stopped.")
 
 
 def docs_command(args):
@@ -254,11 +273,8 @@ def docs_command(args):
         print(f"❌ Error: File '{input_file}' not found.")
         sys.exit(1)
     
-    with open(input_file, 'r') as f:
-        data = json.load(f)
-    
     from models import DesignSystemOutput
-    design_system = DesignSystemOutput(**data)
+    design_system = DesignSystemOutput.model_validate_json(input_file.read_bytes())
     
     # Generate docs
     output_dir = Path(args.output or "docs-site")
@@ -276,22 +292,16 @@ def docs_command(args):
 
 def playground_command(args):
     """Start component playground server."""
-    import subprocess
+    import uvicorn
     
     print("🎮 Starting component playground...\n")
     print("📝 Playground available at http://localhost:8000/playground")
     print("   Press Ctrl+C to stop\n")
     
-    try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn",
-            "web.app:app",
-            "--host", "0.0.0.0",
-            "--port", str(args.port),
-            "--reload"
-        ])
-    except KeyboardInterrupt:
-        print("\n\n👋 Playground server stopped.")
+    # Serve from this process instead of spawning a second interpreter to run uvicorn;
+    # uvicorn handles Ctrl+C itself and returns once the server has shut down
+    uvicorn.run("web.app:app", host="0.0.0.0", port=args.port, reload=True)
+    print("\n👋 Playground server stopped.")
 
 
 def deploy_command(args):
@@ -323,7 +333,7 @@ def deploy_command(args):
         result = deployer.deploy(production=args.production)
         
         if result["success"]:
-            print(f"\n✅ Deployment successful!")
+            print("\n✅ Deployment successful!")
             if result.get("url"):
                 print(f"🌐 URL: {result['url']}")
         else:
@@ -356,16 +366,15 @@ def integrate_command(args):
             print(f"❌ Error: Design system file '{input_file}' not found.")
             sys.exit(1)
         
-        with open(input_file, 'r') as f:
-            data = json.load(f)
-        
         from models import DesignSystemOutput
-        design_system = DesignSystemOutput(**data)
+        design_system = DesignSystemOutput.model_validate_json(input_file.read_bytes())
     else:
         # Generate new design system
         print("📋 Generating design system...")
         product_idea = args.product_idea or input("Enter your product idea: ")
         
+        from main import DesignSystemGenerator
+        from models import DesignSystemInput
         input_data = DesignSystemInput(product_idea=product_idea)
         generator = DesignSystemGenerator()
         design_system = generator.generate_design_system(input_data)
@@ -379,48 +388,52 @@ def integrate_command(args):
     )
     
     # Print results
+    # Collect the report and write it in one go
+    lines = []
     if results['errors']:
-        print(f"\n❌ Integration completed with errors:")
+        lines.append("\n❌ Integration completed with errors:")
         for error in results['errors']:
-            print(f"   ❌ {error}")
+            lines.append(f"   ❌ {error}")
     else:
-        print(f"\n✅ Integration complete!")
+        lines.append("\n✅ Integration complete!")
     
-    print(f"📦 Framework: {results['framework'] or 'Not detected'}")
-    print(f"📦 Package Manager: {results['package_manager']}")
+    lines.append(f"📦 Framework: {results['framework'] or 'Not detected'}")
+    lines.append(f"📦 Package Manager: {results['package_manager']}")
     
     if results.get('warnings'):
-        print(f"\n⚠️  Warnings:")
+        lines.append("\n⚠️  Warnings:")
         for warning in results['warnings']:
-            print(f"   ⚠️  {warning}")
+            lines.append(f"   ⚠️  {warning}")
     
     if results['files_created']:
-        print(f"\n📄 Files created ({len(results['files_created'])}):")
+        lines.append(f"\n📄 Files created ({len(results['files_created'])}):")
         for file in results['files_created']:
-            print(f"   ✓ {file}")
+            lines.append(f"   ✓ {file}")
     
     if results['files_modified']:
-        print(f"\n📝 Files modified ({len(results['files_modified'])}):")
+        lines.append(f"\n📝 Files modified ({len(results['files_modified'])}):")
         for file in results['files_modified']:
-            print(f"   ✏️  {file}")
+            lines.append(f"   ✏️  {file}")
     
     if results['dependencies_added']:
         deps = " ".join(results['dependencies_added'])
         pm = results['package_manager']
         if args.auto_install and not results['errors']:
-            print(f"\n📦 Dependencies installed automatically:")
-            print(f"   ✅ {pm} install -D {deps}")
+            lines.append("\n📦 Dependencies installed automatically:")
+            lines.append(f"   ✅ {pm} install -D {deps}")
         else:
-            print(f"\n📦 Dependencies to install:")
-            print(f"   {pm} install -D {deps}")
+            lines.append("\n📦 Dependencies to install:")
+            lines.append(f"   {pm} install -D {deps}")
     
     if results.get('instructions'):
-        print(f"\n📋 Next steps:")
+        lines.append("\n📋 Next steps:")
         for instruction in results['instructions']:
-            print(f"   • {instruction}")
+            lines.append(f"   • {instruction}")
     
     if not results['errors']:
-        print(f"\n🎉 Design system integrated! Start using it in your project.")
+        lines.append("\n🎉 Design system integrated! Start using it in your project.")
+    
+    print("\n".join(lines))
 
 
 def main():
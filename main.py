@@ -1,11 +1,13 @@
 """Main application for the Design System Generator."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from agents.design_strategist.agent import DesignStrategistAgent
 from agents.visual_identity.agent import VisualIdentityAgent
 from agents.component_architect.agent import ComponentArchitectAgent
 from agents.collaboration import AgentCollaboration
 from agents.validator import Validator
+from agents.knowledge_base import KnowledgeBase
 from templates.components.generator import ComponentGenerator
 from models import DesignSystemInput, DesignSystemOutput, ComponentCode, TestFile
 
@@ -35,7 +37,12 @@ class DesignSystemGenerator:
 
         # Step 1: Design Strategy
         print("\n1️⃣ Analyzing requirements with Design Strategist...")
-        design_principles = self.design_strategist.analyze_product_requirements(input_data)
+        # Prepare the Component Architect's industry context while the strategist waits on the LLM
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            strategist_future = executor.submit(self.design_strategist.analyze_product_requirements, input_data)
+            industry_guess = KnowledgeBase.detect_industry(input_data.product_idea)
+            component_context = self.component_architect.prepare_component_context(industry_guess)
+            design_principles = strategist_future.result()
         print(f"   📋 Philosophy: {design_principles.philosophy}")
         print(f"   📏 Density: {design_principles.density}")
         print(f"   🎯 Clarity: {design_principles.clarity}/10")
@@ -70,7 +77,7 @@ class DesignSystemGenerator:
         # Step 3: Component Architecture
         print("\n3️⃣ Designing component system with Component Architect...")
         component_inventory = self.component_architect.generate_component_inventory(
-            design_principles, input_data.product_idea
+            design_principles, input_data.product_idea, prefetched_context=component_context
         )
         print(f"   🧩 Defined {len(component_inventory.components)} components")
         print(f"   🔄 Reusable: {len(component_inventory.reusable_components)}")
@@ -464,8 +471,7 @@ class DesignSystemGenerator:
 
         # Generate comprehensive guidelines
         industry = design_principles.industry_context.industry if design_principles.industry_context else "unknown"
-        from agents.knowledge_base import KnowledgeBase
-        accessibility_reqs = KnowledgeBase.get_accessibility_requirements(industry)
+        accessibility_reqs = KnowledgeBase.get_profile(industry).accessibility
         
         guidelines = {
             "color_usage": "Use semantic colors for status, primary colors for actions",
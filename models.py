@@ -30,6 +30,11 @@ class Platform(str, Enum):
     MARKETING = "marketing"
 
 
+def enum_values(members: Optional[List[Enum]]) -> List[str]:
+    """Plain values of enum members, reading _value_ directly to skip the Enum.value descriptor."""
+    return [m._value_ for m in members] if members else []
+
+
 class DesignSystemInput(BaseModel):
     """Input parameters for design system generation."""
     product_idea: str = Field(..., description="Description of the product or domain")
@@ -92,6 +97,11 @@ class TypographyToken(BaseModel):
     line_height: float
     role: Literal["heading", "body", "ui", "display"]
 
+    @property
+    def size_px(self) -> float:
+        """Numeric font size, parsed from the "<n>px" size."""
+        return float(self.size.replace('px', ''))
+
 
 class SpacingToken(BaseModel):
     """Spacing token."""
@@ -99,6 +109,11 @@ class SpacingToken(BaseModel):
     value: str  # CSS value
     scale: int  # Position in scale
 
+    @property
+    def value_px(self) -> int:
+        """Numeric spacing value, parsed from the "<n>px" value."""
+        return int(self.value.replace('px', ''))
+
 
 class ColorRationale(BaseModel):
     """Rationale for color choices."""
@@ -121,6 +136,19 @@ class DesignTokens(BaseModel):
     color_rationale: Optional[ColorRationale] = None
     primary_recommendations: Optional[List[Dict[str, Any]]] = Field(default=None, description="Multiple primary color recommendations with their secondary colors and rationales")
 
+    @property
+    def colors_by_name(self) -> Dict[str, ColorToken]:
+        """Light-mode color tokens keyed by name, for O(1) lookups (built per access; hold on to it)."""
+        return {c.name: c for c in self.colors}
+
+    @property
+    def colors_by_role(self) -> Dict[str, List[ColorToken]]:
+        """Light-mode color tokens grouped by role, in palette order (built per access)."""
+        by_role: Dict[str, List[ColorToken]] = {}
+        for c in self.colors:
+            by_role.setdefault(c.role, []).append(c)
+        return by_role
+
 
 class ComponentSpec(BaseModel):
     """Component specification."""
@@ -28,6 +28,7 @@ setup(
         "colorama>=0.4.6",
         "rich>=13.7.0",
         "litellm>=1.15.0",
+        "orjson>=3.9.0",
         "click>=8.1.0",
     ],
     entry_points={
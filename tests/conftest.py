@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the repo's top-level modules importable."""
+
+import sys
+from pathlib import Path
+
+# Same layout assumption as cli/cli.py: models, main and agents live at the repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,32 @@
+"""Tests for the refinement decision in agent collaboration."""
+
+import itertools
+
+import pytest
+
+from agents.collaboration import HARD_FAIL_SCORE, AgentCollaboration
+from models import ValidationResult
+
+
+def _results(*scores):
+    return {f"check_{i}": ValidationResult(valid=score >= 0.7, score=score) for i, score in enumerate(scores)}
+
+
+def test_hard_failure_forces_refinement_despite_high_mean():
+    results = _results(1.0, 1.0, 1.0, 1.0, HARD_FAIL_SCORE - 0.1)
+
+    assert sum(r.score for r in results.values()) / len(results) >= 0.7
+    assert AgentCollaboration.should_refine(results)
+
+
+def test_scores_at_hard_fail_threshold_do_not_force_refinement():
+    assert not AgentCollaboration.should_refine(_results(1.0, 1.0, 1.0, 1.0, HARD_FAIL_SCORE))
+
+
+def test_no_results_needs_refinement():
+    assert AgentCollaboration.should_refine({})
+
+
+@pytest.mark.parametrize("scores", list(itertools.product((0.3, 0.5, 0.7, 0.9, 1.0), repeat=3)))
+def test_matches_mean_threshold_without_hard_failures(scores):
+    assert AgentCollaboration.should_refine(_results(*scores)) == (sum(scores) / len(scores) < 0.7)
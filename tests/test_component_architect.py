@@ -0,0 +1,70 @@
+"""Tests for the component architect's LLM gating."""
+
+import pytest
+
+from agents import llm_cache
+from agents.component_architect import agent as architect
+from agents.design_strategist.agent import DesignStrategistAgent
+from agents.knowledge_base import KnowledgeBase
+from models import DesignSystemInput
+
+
+def _principles(product_idea):
+    strategist = DesignStrategistAgent()
+    strategist.api_key = None
+    return strategist.analyze_product_requirements(DesignSystemInput(product_idea=product_idea))
+
+
+def _recording_llm(monkeypatch):
+    calls = []
+
+    def fake_complete_json(**kwargs):
+        calls.append(kwargs)
+        return {"additional_components": [], "component_variants": {}, "component_states": {}, "reasoning": ""}
+
+    monkeypatch.setattr(architect, "complete_json", fake_complete_json)
+    llm_cache.clear()
+    return calls
+
+
+@pytest.mark.parametrize("product_idea, industry, llm_calls", [
+    ("patient records portal", "healthcare", 0),
+    ("fitness tracker", "unknown", 1),
+])
+def test_llm_consulted_only_without_complete_coverage(monkeypatch, product_idea, industry, llm_calls):
+    calls = _recording_llm(monkeypatch)
+
+    principles = _principles(product_idea)
+    agent = architect.ComponentArchitectAgent()
+    agent.api_key = "test-key"
+    agent.generate_component_inventory(principles, product_idea)
+
+    assert principles.industry_context.industry == industry
+    assert len(calls) == llm_calls
+
+
+def test_core_components_match_base_inventory():
+    context = architect.ComponentArchitectAgent().prepare_component_context("unknown")
+
+    assert {c.name for c in context["base_components"]} == KnowledgeBase.CORE_COMPONENTS
+
+
+def test_malformed_response_is_not_cached(monkeypatch):
+    calls = []
+
+    def fake_complete_json(**kwargs):
+        calls.append(kwargs)
+        return ["not", "an", "object"]
+
+    monkeypatch.setattr(architect, "complete_json", fake_complete_json)
+    monkeypatch.setattr(architect.KnowledgeBase, "has_complete_coverage", staticmethod(lambda industry: False))
+    llm_cache.clear()
+
+    principles = _principles("project management tool")
+    agent = architect.ComponentArchitectAgent()
+    agent.api_key = "test-key"
+    for _ in range(2):
+        inventory = agent.generate_component_inventory(principles, "project management tool")
+        assert inventory.components
+
+    assert len(calls) == 2
@@ -0,0 +1,122 @@
+"""Tests for the knowledge base lookups."""
+
+import pytest
+
+from agents import knowledge_base
+from agents.knowledge_base import KnowledgeBase
+
+
+@pytest.mark.parametrize("product_idea, industry", [
+    ("Healthcare app", "healthcare"),
+    ("Healthcare platform", "healthcare"),
+    ("healthcare portal", "healthcare"),
+    ("clinical trial management tool", "healthcare"),
+    ("telehealth scheduling", "healthcare"),
+    ("patient records system", "healthcare"),
+    ("banking app for students", "finance"),
+    ("Online shopping platform", "ecommerce"),
+    ("e-commerce storefront", "ecommerce"),
+    ("crypto dashboard", "dashboard"),
+    ("analytics platform for sales teams", "dashboard"),
+    ("project management tool", "saas"),
+    ("An application for managing tasks", "saas"),
+    ("online course", "education"),
+    ("marketing landing page", "marketing"),
+    ("Social media scheduler", "marketing"),
+    ("B2B invoicing", "enterprise"),
+    ("personal journaling", "consumer"),
+    ("fitness tracker", "unknown"),
+])
+def test_detect_industry(product_idea, industry):
+    assert KnowledgeBase.detect_industry(product_idea) == industry
+
+
+@pytest.mark.parametrize("product_idea, industry", [
+    ("bookstore", "ecommerce"),
+    ("webshop", "ecommerce"),
+    ("online bookshop", "ecommerce"),
+    ("mHealth app", "healthcare"),
+    ("preschool planner", "education"),
+    ("superusers", "consumer"),
+])
+def test_detect_industry_matches_compound_words(product_idea, industry):
+    assert KnowledgeBase.detect_industry(product_idea) == industry
+
+
+def test_detect_industry_matches_other_keywords_at_word_start_only():
+    # "happy" contains "app" but is not a SaaS keyword
+    assert KnowledgeBase.detect_industry("happy hour finder") == "unknown"
+
+
+@pytest.mark.parametrize("industry", [*KnowledgeBase.COMPONENT_BY_INDUSTRY, "unknown"])
+def test_complete_coverage_follows_component_specs(industry):
+    components = KnowledgeBase.COMPONENT_BY_INDUSTRY.get(industry)
+    covered = components is not None and all(
+        c in KnowledgeBase.COMPONENT_SPECS for c in components if c not in KnowledgeBase.CORE_COMPONENTS
+    )
+    assert KnowledgeBase.has_complete_coverage(industry) == covered
+
+
+def test_complete_coverage_is_not_vacuous():
+    assert KnowledgeBase.has_complete_coverage("healthcare")
+    assert not KnowledgeBase.has_complete_coverage("unknown")
+
+
+@pytest.mark.parametrize("industry", ["healthcare", "marketing", "unknown"])
+def test_legacy_getters_match_profile(industry):
+    profile = KnowledgeBase.get_profile(industry)
+    colors = KnowledgeBase.get_industry_color_suggestions(industry)
+
+    assert colors == (dict(profile.colors) if profile.colors is not None else None)
+    assert KnowledgeBase.get_components_for_industry(industry) == list(profile.components)
+    assert KnowledgeBase.get_philosophy_for_industry(industry) == profile.philosophy
+    assert KnowledgeBase.get_density_for_industry(industry) == profile.density
+    assert KnowledgeBase.get_warmth_for_industry(industry) == profile.warmth
+    assert KnowledgeBase.get_clarity_for_industry(industry) == profile.clarity
+    assert KnowledgeBase.get_speed_for_industry(industry) == profile.speed
+    assert KnowledgeBase.get_accessibility_requirements(industry) == list(profile.accessibility)
+
+
+def test_legacy_getters_return_caller_owned_copies():
+    KnowledgeBase.get_components_for_industry("healthcare").append("Extra")
+    KnowledgeBase.get_industry_color_suggestions("healthcare")["primary"] = "#000000"
+
+    assert "Extra" not in KnowledgeBase.get_components_for_industry("healthcare")
+    assert KnowledgeBase.get_industry_color_suggestions("healthcare")["primary"] != "#000000"
+
+
+@pytest.mark.parametrize("component, expected", [
+    ("Sidebar", ("Navigation", "Header")),
+    ("DataTable", ("Table", "Pagination", "Search", "Select")),
+    ("Hero", ("Button",)),
+    ("Button", ()),
+])
+def test_transitive_dependencies(component, expected):
+    assert KnowledgeBase.get_transitive_dependencies(component) == expected
+
+
+@pytest.mark.parametrize("component", list(KnowledgeBase.COMPONENT_DEPENDENCIES))
+def test_transitive_dependencies_are_closed(component):
+    closure = KnowledgeBase.get_transitive_dependencies(component)
+
+    assert component not in closure
+    assert set(KnowledgeBase.get_component_dependencies(component)) <= set(closure)
+    for dep in closure:
+        assert set(KnowledgeBase.get_transitive_dependencies(dep)) - {component} <= set(closure)
+
+
+def test_dependency_closure_terminates_on_cycles(monkeypatch):
+    monkeypatch.setattr(knowledge_base, "_COMPONENT_DEPENDENCIES", {"A": ["B"], "B": ["C"], "C": ["A"]})
+
+    assert knowledge_base._dependency_closure("A") == ("B", "C")
+    assert knowledge_base._dependency_closure("B") == ("C", "A")
+    assert knowledge_base._dependency_closure("C") == ("A", "B")
+
+
+def test_trait_conflicts_keep_trait_order_and_both_directions():
+    assert KnowledgeBase.check_trait_conflicts(["minimal", "bold"]) == ["minimal conflicts with bold"]
+    assert KnowledgeBase.check_trait_conflicts(["clinical", "playful", "bold"]) == [
+        "clinical conflicts with playful",
+        "clinical conflicts with bold",
+        "playful conflicts with clinical",
+    ]
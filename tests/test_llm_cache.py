@@ -0,0 +1,48 @@
+"""Tests for the LLM response cache."""
+
+import pytest
+
+from agents import llm_cache
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    llm_cache.clear()
+    yield
+    llm_cache.clear()
+
+
+def _store(text, response, scope="scope"):
+    llm_cache.store("model", llm_cache.prompt_hash(text), response, llm_cache.embed(text), scope)
+
+
+def _lookup(text, scope="scope"):
+    return llm_cache.lookup("model", llm_cache.prompt_hash(text), llm_cache.embed(text), scope)
+
+
+def test_exact_prompt_is_a_hit():
+    _store("Marketplace for buying, not selling, used books", {"answer": 1})
+
+    assert _lookup("marketplace  for buying, not selling, used books") == {"answer": 1}
+
+
+def test_near_duplicate_prompt_is_a_hit_within_scope():
+    _store("A marketplace for used books and rare vintage comics", {"answer": 1})
+
+    assert _lookup("A marketplace for used books and vintage rare comics") == {"answer": 1}
+    assert _lookup("A marketplace for used books and vintage rare comics", scope="other") is None
+
+
+def test_negated_prompt_matches_only_exactly():
+    _store("Marketplace for buying, not selling, used books", {"answer": 1})
+
+    assert _lookup("Marketplace for selling, not buying, used books") is None
+
+
+def test_prompt_with_a_different_vocabulary_size_is_a_miss():
+    base = "used books rare comics vintage records old maps antique toys " * 3
+    _store(base, {"answer": 1})
+
+    # Similar enough by cosine, but two extra words is more than the length check allows
+    assert llm_cache._cosine(llm_cache.embed(base), llm_cache.embed(base + "for collectors")) >= 0.95
+    assert _lookup(base + "for collectors") is None
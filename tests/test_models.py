@@ -0,0 +1,85 @@
+"""Tests for the derived views on the data models."""
+
+from agents.validator import Validator
+from models import ColorToken, ComponentInventory, ComponentSpec, DesignTokens, SpacingToken, TypographyToken
+
+
+def _tokens(primary_500):
+    return DesignTokens(
+        colors=[
+            ColorToken(name="primary-500", value=primary_500, role="primary"),
+            ColorToken(name="neutral-50", value="#fafafa", role="neutral"),
+            ColorToken(name="error-500", value="#dc2626", role="semantic"),
+        ],
+        typography=[],
+        spacing=[],
+        border_radius={},
+        shadows={},
+    )
+
+
+def test_color_indexes_follow_reassigned_colors():
+    tokens = _tokens("#111111")
+    assert tokens.colors_by_name["primary-500"].value == "#111111"
+
+    tokens.colors = [ColorToken(name="primary-500", value="#eeeeee", role="primary")]
+
+    assert tokens.colors_by_name["primary-500"].value == "#eeeeee"
+    assert [c.value for c in tokens.colors_by_role["primary"]] == ["#eeeeee"]
+    assert "semantic" not in tokens.colors_by_role
+
+
+def test_color_indexes_follow_model_copy_update():
+    tokens = _tokens("#111111")
+    tokens.colors_by_name
+
+    copy = tokens.model_copy(update={"colors": [ColorToken(name="primary-500", value="#eeeeee", role="primary")]})
+
+    assert copy.colors_by_name["primary-500"].value == "#eeeeee"
+
+
+def test_accessibility_check_sees_reassigned_colors():
+    tokens = _tokens("#111111")
+    assert Validator.validate_color_accessibility(tokens).valid
+
+    tokens.colors = _tokens("#eeeeee").colors
+
+    assert not Validator.validate_color_accessibility(tokens).valid
+
+
+def test_numeric_sizes_follow_reassigned_values():
+    font = TypographyToken(name="body", family="Inter", size="16px", weight=400, line_height=1.5, role="body")
+    space = SpacingToken(name="md", value="16px", scale=4)
+    assert font.size_px == 16.0 and space.value_px == 16
+
+    font.size = "18px"
+    space.value = "24px"
+
+    assert font.size_px == 18.0 and space.value_px == 24
+
+
+def test_completeness_check_sees_replaced_components():
+    def spec(name):
+        return ComponentSpec(name=name, category="layout", variants=[], states=[], description="")
+
+    def missing_critical(inventory):
+        result = Validator.validate_component_completeness(inventory, "saas", "")
+        return [issue for issue in result.issues if issue.startswith("Missing critical components")]
+
+    inventory = ComponentInventory(components=[], reusable_components=[], contextual_components=[])
+    assert missing_critical(inventory)
+
+    inventory.components = [spec(name) for name in ("Button", "Input", "Select", "Modal", "Alert")]
+
+    assert missing_critical(inventory) == []
+
+
+def test_semantic_colors_are_found_by_name_whatever_their_role():
+    tokens = _tokens("#111111")
+    tokens.colors.append(ColorToken(name="warning-500", value="#ffff00", role="accent"))
+
+    table = Validator.build_color_table(tokens)
+
+    assert table["semantic"]["error"] == "#dc2626"
+    assert table["semantic"]["warning"] == "#ffff00"
+    assert any("Warning color" in issue for issue in Validator.validate_color_accessibility(tokens).issues)
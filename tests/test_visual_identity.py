@@ -0,0 +1,52 @@
+"""Tests for the rule-based (no API key) visual identity output."""
+
+import pytest
+
+from agents.design_strategist.agent import DesignStrategistAgent
+from agents.validator import Validator
+from agents.visual_identity.agent import VisualIdentityAgent
+from models import DesignSystemInput
+
+
+def _rule_based(agent_cls):
+    agent = agent_cls()
+    agent.api_key = None
+    return agent
+
+
+@pytest.mark.parametrize("product_idea", [
+    "project management tool",
+    "crypto dashboard",
+    "marketing landing page",
+    "online course",
+    "healthcare patient portal",
+])
+def test_generated_palette_passes_color_accessibility(product_idea):
+    principles = _rule_based(DesignStrategistAgent).analyze_product_requirements(DesignSystemInput(product_idea=product_idea))
+    tokens = _rule_based(VisualIdentityAgent).generate_design_tokens(principles, product_idea)
+
+    result = Validator.validate_color_accessibility(tokens)
+    assert result.valid, result.issues
+
+
+def test_ensure_contrast_meets_target_on_tinted_surface():
+    surface = VisualIdentityAgent.light_surface_hex("#64748b")
+    adjusted, contrast = VisualIdentityAgent.ensure_contrast("#6b8cff", surface, min_contrast=4.5)
+
+    assert contrast >= 4.5
+    assert Validator.get_contrast_ratio(adjusted, surface) == pytest.approx(contrast)
+    assert Validator.contrast_on_white(adjusted) >= 4.5
+
+
+def test_editing_tokens_does_not_leak_into_later_results():
+    principles = _rule_based(DesignStrategistAgent).analyze_product_requirements(DesignSystemInput(product_idea="crypto dashboard"))
+    agent = _rule_based(VisualIdentityAgent)
+
+    first = agent.generate_design_tokens(principles, "crypto dashboard")
+    expected = agent.generate_design_tokens(principles, "crypto dashboard").model_dump()
+    first.typography[0].size = "1px"
+    first.spacing[0].value = "1px"
+    first.dark_colors[0].value = "#000000"
+    first.colors_by_name["success-500"].value = "#000000"
+
+    assert agent.generate_design_tokens(principles, "crypto dashboard").model_dump() == expected